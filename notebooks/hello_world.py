@@ -4,6 +4,7 @@
 #%%
 # Imports and configuration
 import yfinance as yf
+from curl_cffi import requests as curl_requests
 import pandas as pd
 import matplotlib.pyplot as plt
 from datetime import datetime
@@ -18,6 +19,14 @@ TICKERS = {
 START = '2024-01-01'
 END = datetime.today().strftime('%Y-%m-%d')
 
+# Outputs are written as Parquet (binary, typed, zstd-compressed); flip to True to also
+# write the legacy CSV copies for tools that still expect text files
+SAVE_CSV = False
+
+# One module-level HTTP session keeps the connection pool (and TLS sessions) warm across
+# tickers and across repeated cell runs. yfinance only accepts curl_cffi sessions.
+_YF_SESSION = curl_requests.Session(impersonate='chrome')
+
 # %%
 # Simple fetch function using yfinance. Returns a DataFrame or a dict of DataFrames depending on input.
 def fetch_tickers(ticker_list, start=START, end=END, interval='1d'):
@@ -29,16 +38,17 @@ def fetch_tickers(ticker_list, start=START, end=END, interval='1d'):
         return pd.DataFrame()
 
     # yfinance can download multiple tickers at once; use auto_adjust to get adjusted prices
-    raw = yf.download(ticker_list, start=start, end=end, interval=interval, group_by='ticker', auto_adjust=True, threads=True)
+    raw = yf.download(ticker_list, start=start, end=end, interval=interval, group_by='ticker', auto_adjust=True,
+                      threads=True, session=_YF_SESSION, progress=False)
 
     # If single ticker, ensure consistent DataFrame
     if isinstance(raw.columns, pd.MultiIndex):
-        # We'll extract the 'Close' column (already adjusted due to auto_adjust)
-        adj_close = pd.concat([raw[t]['Close'].rename(t) for t in ticker_list], axis=1)
+        # We'll extract the 'Close' column (already adjusted due to auto_adjust) in one
+        # cross-section slice; reindex keeps the requested ticker order
+        adj_close = raw.xs('Close', axis=1, level=1).reindex(columns=ticker_list)
     else:
         # raw is a single ticker DataFrame
-        adj_close = raw['Close'].to_frame()
-        adj_close.columns = ticker_list
+        adj_close = raw[['Close']].rename(columns={'Close': ticker_list[0]})
 
     return adj_close
 
@@ -50,8 +60,10 @@ import os
 os.makedirs('data', exist_ok=True)
 
 sample = fetch_tickers(['BTC-USD', '^GSPC'])
-sample_path = 'data/hello_world_sample_combined_from_notebook.csv'
-sample.to_csv(sample_path)
+sample_path = 'data/hello_world_sample_combined_from_notebook.parquet'
+sample.to_parquet(sample_path, engine='pyarrow', compression='zstd')
+if SAVE_CSV:
+    sample.to_csv(sample_path.replace('.parquet', '.csv'))
 print('Saved:', sample_path)
 print('Shape:', sample.shape)
 print(sample.head())
@@ -72,7 +84,9 @@ plt.show()
 
 # compute daily returns and save
 returns = sample.pct_change().dropna()
-returns_path = 'results/hello_world_returns.csv'
-returns.to_csv(returns_path)
+returns_path = 'results/hello_world_returns.parquet'
+returns.to_parquet(returns_path, engine='pyarrow', compression='zstd')
+if SAVE_CSV:
+    returns.to_csv(returns_path.replace('.parquet', '.csv'))
 print('Saved returns:', returns_path)
 print('Figure saved:', fig_path)
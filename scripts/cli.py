@@ -1,9 +1,11 @@
 #!/usr/bin/env python3
 """Central CLI to run repository scripts from one place.
 
-This prevents having many ad-hoc top-level scripts. It invokes the existing
-script files under `scripts/` using the repository Python interpreter so
-behaviour is identical to running them directly.
+This prevents having many ad-hoc top-level scripts. It imports the existing
+script modules under `scripts/` and calls their `main(argv)` in-process, which
+avoids paying interpreter startup and pandas/numpy imports per command. If a
+script cannot be imported it falls back to running it in a subprocess with the
+repository Python interpreter.
 
 Usage examples:
   python scripts/cli.py fetch-1m --symbols BTC --limit 120
@@ -14,12 +16,23 @@ Usage examples:
 """
 from __future__ import annotations
 import argparse
+import importlib
 import subprocess
 import sys
 from pathlib import Path
 
 REPO_ROOT = Path(__file__).resolve().parents[1]
 SCRIPTS_DIR = REPO_ROOT / 'scripts'
+# make `scripts.<name>` importable when this file is run directly
+if str(REPO_ROOT) not in sys.path:
+    sys.path.insert(0, str(REPO_ROOT))
+
+
+def _run_subprocess(script_path: Path, extra_args: list[str]) -> int:
+    cmd = [sys.executable, str(script_path)] + extra_args
+    print(f"Running: {' '.join(cmd)}")
+    proc = subprocess.run(cmd)
+    return proc.returncode
 
 
 def run_script(script_name: str, extra_args: list[str] | None = None) -> int:
@@ -27,12 +40,23 @@ def run_script(script_name: str, extra_args: list[str] | None = None) -> int:
     if not script_path.exists():
         print(f"Script not found: {script_path}")
         return 2
-    cmd = [sys.executable, str(script_path)]
-    if extra_args:
-        cmd += extra_args
-    print(f"Running: {' '.join(cmd)}")
-    proc = subprocess.run(cmd)
-    return proc.returncode
+    args = list(extra_args or [])
+    try:
+        mod = importlib.import_module(f"scripts.{script_path.stem}")
+    except ImportError as e:
+        print(f"Could not import {script_name} in-process ({e}); falling back to a subprocess")
+        return _run_subprocess(script_path, args)
+
+    print(f"Running: {script_name} {' '.join(args)}".rstrip())
+    try:
+        rc = mod.main(args)
+    except SystemExit as e:
+        # argparse --help / usage errors exit from inside main()
+        rc = e.code
+    if rc is None or isinstance(rc, int):
+        return rc or 0
+    print(rc)
+    return 1
 
 
 def main(argv: list[str] | None = None) -> int:
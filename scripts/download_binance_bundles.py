@@ -9,19 +9,29 @@ using the convention:
 Defaults to the last 30 days and the repo's major pairs if no symbols provided.
 Use --days-back to control range, or --start-date/--end-date for explicit ranges.
 
+Downloads run concurrently on a thread pool (--workers) sharing one keep-alive
+session; --pause spaces request starts so the overall request rate stays polite.
+
 Run with --dry-run to only print planned URLs.
 """
 from __future__ import annotations
 from pathlib import Path
 import argparse
+import os
+import shutil
 import sys
+import threading
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
+from typing import Iterator
 import requests
 from requests.adapters import HTTPAdapter, Retry
 import time
 
 REPO_ROOT = Path(__file__).resolve().parents[1]
 DEFAULT_BUNDLE_DIR = REPO_ROOT / 'bundles'
+COPY_CHUNK_SIZE = 1 << 20  # 1 MiB per read/write when streaming ZIPs to disk
 
 
 def get_major_pairs():
@@ -36,38 +46,103 @@ def daterange(start_date: datetime, end_date: datetime):
         cur += timedelta(days=1)
 
 
+class RateLimiter:
+    """Space request starts at least `min_interval` seconds apart across threads."""
+
+    def __init__(self, min_interval: float):
+        self.min_interval = min_interval
+        self._lock = threading.Lock()
+        self._next_at = 0.0
+
+    def wait(self):
+        if self.min_interval <= 0:
+            return
+        with self._lock:
+            now = time.monotonic()
+            start_at = max(now, self._next_at)
+            self._next_at = start_at + self.min_interval
+        if start_at > now:
+            time.sleep(start_at - now)
+
+
 def download_file(url: str, dest: Path, session: requests.Session, dry_run: bool = False, force: bool = False) -> bool:
     if dry_run:
         print(f"DRY RUN: would download {url} -> {dest}")
         return True
-    dest.parent.mkdir(parents=True, exist_ok=True)
     if dest.exists() and not force:
         print(f"Skipping existing file: {dest}")
         return True
     if dest.exists() and force:
+        # the old file is only replaced once the new download completed
         print(f"Overwriting existing file (force): {dest}")
-        try:
-            dest.unlink()
-        except Exception:
-            # if unlink fails, we'll attempt to overwrite when writing
-            pass
     print(f"Downloading: {url}")
+    # Write to a .part file and rename it onto dest only on success, so an interrupted or
+    # failed download never leaves a (preallocated, hence full-size) dest that later runs skip
+    part = dest.with_suffix(dest.suffix + '.part')
     try:
-        r = session.get(url, stream=True, timeout=30)
-        if r.status_code == 200:
-            with open(dest, 'wb') as fh:
-                for chunk in r.iter_content(chunk_size=8192):
-                    if chunk:
-                        fh.write(chunk)
-            return True
-        else:
-            print(f"Not found or error: {url} (status {r.status_code})")
-            return False
+        with session.get(url, stream=True, timeout=30) as r:
+            if r.status_code == 200:
+                # Copy the raw stream in 1 MiB blocks instead of a Python loop over 8 KiB chunks
+                r.raw.decode_content = True
+                # Binance sends Content-Length; preallocate so concurrent writers don't fragment
+                # extents. Skip when the body is content-encoded (length is of the encoded bytes).
+                size = 0 if r.headers.get('content-encoding') else int(r.headers.get('content-length') or 0)
+                with open(part, 'wb') as fh:
+                    if size and hasattr(os, 'posix_fallocate'):
+                        try:
+                            os.posix_fallocate(fh.fileno(), 0, size)
+                        except OSError:
+                            pass  # filesystem without fallocate support; plain writes still work
+                    shutil.copyfileobj(r.raw, fh, length=COPY_CHUNK_SIZE)
+                    # drop any preallocated tail if the body came up short
+                    fh.truncate()
+                part.replace(dest)
+                return True
+            else:
+                print(f"Not found or error: {url} (status {r.status_code})")
+                return False
     except Exception as e:
         print(f"Download failed: {url} -> {e}")
+        part.unlink(missing_ok=True)
         return False
 
 
+def _download_one(item: tuple[str, Path], session: requests.Session, limiter: RateLimiter,
+                  dry_run: bool = False, force: bool = False) -> bool:
+    """Worker entry point: throttle, then download one planned (url, dest) pair."""
+    url, dest = item
+    if not dry_run:
+        limiter.wait()
+    return download_file(url, dest, session, dry_run=dry_run, force=force)
+
+
+def iter_planned(symbols: list[str], tf: str, period: str, start: datetime, end: datetime,
+                 bundle_dir: Path) -> Iterator[tuple[str, Path]]:
+    """Lazily yield (url, dest) pairs for every symbol and day/month in [start, end]."""
+    # Select base URL, target dir and date labels according to desired bundle period.
+    # Date strings are shared by every symbol, so format them once up front.
+    if period == 'monthly':
+        base_url = 'https://data.binance.vision/data/spot/monthly/klines'
+        dest_dir = bundle_dir / f"monthly_{tf}"
+        date_strs = []
+        # iterate months between start and end (inclusive)
+        y, m = start.year, start.month
+        while (y, m) <= (end.year, end.month):
+            date_strs.append(f"{y:04d}-{m:02d}")
+            y, m = (y + 1, 1) if m == 12 else (y, m + 1)
+    else:
+        base_url = 'https://data.binance.vision/data/spot/daily/klines'
+        dest_dir = bundle_dir / tf
+        date_strs = [dt.strftime('%Y-%m-%d') for dt in daterange(start.date(), end.date())]
+
+    for sym in symbols:
+        # symbol-level prefixes: only the date part changes in the inner loop
+        name_prefix = f"{sym}-{tf}-"
+        url_prefix = f"{base_url}/{sym}/{tf}/{name_prefix}"
+        for date_str in date_strs:
+            yield url_prefix + date_str + '.zip', dest_dir / (name_prefix + date_str + '.zip')
+
+
 def main(argv=None):
     p = argparse.ArgumentParser(description='Download Binance daily kline bundles')
     p.add_argument('--bundle-dir', default=str(DEFAULT_BUNDLE_DIR), help='Local folder to store bundles')
@@ -79,7 +154,8 @@ def main(argv=None):
     p.add_argument('--end-date', help='End date YYYY-MM-DD (overrides days-back)')
     p.add_argument('--dry-run', action='store_true', help='Only print planned downloads')
     p.add_argument('--force', action='store_true', help='Force re-download and overwrite existing files')
-    p.add_argument('--pause', type=float, default=0.05, help='Pause between downloads (s)')
+    p.add_argument('--pause', type=float, default=0.05, help='Minimum spacing between request starts across all workers (s)')
+    p.add_argument('--workers', type=int, default=16, help='Number of concurrent download threads (default 16)')
     args = p.parse_args(argv)
 
     bundle_dir = Path(args.bundle_dir)
@@ -100,49 +176,40 @@ def main(argv=None):
         end = datetime.utcnow()
         start = end - timedelta(days=args.days_back)
 
+    workers = max(1, args.workers)
+    # One shared session; the connection pool is sized to the worker count so
+    # every thread can reuse a keep-alive connection instead of re-handshaking.
     session = requests.Session()
     retries = Retry(total=3, backoff_factor=1, status_forcelist=[429,500,502,503,504])
-    session.mount('https://', HTTPAdapter(max_retries=retries))
-
-    # Select base URL according to desired bundle period
-    if args.period == 'monthly':
-        base_url = 'https://data.binance.vision/data/spot/monthly/klines'
-    else:
-        base_url = 'https://data.binance.vision/data/spot/daily/klines'
-
-    planned = []
-    for sym in symbols:
-        if args.period == 'monthly':
-            # iterate months between start and end (inclusive)
-            cur = datetime(start.year, start.month, 1)
-            last = datetime(end.year, end.month, 1)
-            while cur <= last:
-                date_str = cur.strftime('%Y-%m')
-                filename = f"{sym}-{tf}-{date_str}.zip"
-                url = f"{base_url}/{sym}/{tf}/{filename}"
-                dest = bundle_dir / f"monthly_{tf}" / filename
-                planned.append((url, dest))
-                # advance one month
-                if cur.month == 12:
-                    cur = datetime(cur.year + 1, 1, 1)
-                else:
-                    cur = datetime(cur.year, cur.month + 1, 1)
-        else:
-            for dt in daterange(start.date(), end.date()):
-                date_str = dt.strftime('%Y-%m-%d')
-                filename = f"{sym}-{tf}-{date_str}.zip"
-                url = f"{base_url}/{sym}/{tf}/{filename}"
-                dest = bundle_dir / tf / filename
-                planned.append((url, dest))
-
-    # Dry-run prints planned items; otherwise attempt downloads.
-    success = 0
-    total = len(planned)
-    for url, dest in planned:
-        ok = download_file(url, dest, session, dry_run=args.dry_run, force=args.force)
-        if ok:
-            success += 1
-        time.sleep(args.pause)
+    session.mount('https://', HTTPAdapter(pool_connections=workers, pool_maxsize=workers, max_retries=retries))
+
+    # Dry-run prints planned items; otherwise attempt downloads concurrently.
+    # Planning is lazy and at most `workers * 4` downloads are in flight, so memory
+    # stays flat for long ranges and downloads start before planning finishes.
+    total = skipped = success = 0
+    limiter = RateLimiter(args.pause)
+    pending: deque = deque()
+    # Every file of a run lands in a handful of parent dirs; create each one once here
+    # rather than per file inside download_file.
+    made_dirs: set[Path] = set()
+    with ThreadPoolExecutor(max_workers=workers) as ex:
+        for item in iter_planned(symbols, tf, args.period, start, end, bundle_dir):
+            total += 1
+            # Files already on disk need no HTTP work at all (unless --force)
+            if not args.force and item[1].exists():
+                skipped += 1
+                continue
+            parent = item[1].parent
+            if not args.dry_run and parent not in made_dirs:
+                parent.mkdir(parents=True, exist_ok=True)
+                made_dirs.add(parent)
+            if len(pending) >= workers * 4:
+                success += pending.popleft().result()
+            pending.append(ex.submit(_download_one, item, session, limiter, dry_run=args.dry_run, force=args.force))
+        success += sum(f.result() for f in pending)
+    if skipped:
+        print(f"Skipped {skipped} existing files")
+    success += skipped
 
     print(f"Planned: {total}, succeeded (or would succeed in dry-run): {success}")
     return 0
@@ -1,14 +1,15 @@
 #!/usr/bin/env python3
 """Fetch 1-minute OHLCV for given symbols using our CryptoDataFetcher.
 
-This uses the existing fetcher to fetch 1m candles and save canonical CSVs
-under `data/crypto/USDT/<BASE>/crypto_<BASE>_USDT_1m.csv`.
+This uses the existing fetcher to fetch 1m candles and save canonical Parquet files
+under `data/crypto/USDT/<BASE>/crypto_<BASE>_USDT_1m.parquet`.
 
 Default behavior: if no symbols provided, fetch top major pairs (first 5).
 """
 from pathlib import Path
 import sys
 import argparse
+from concurrent.futures import ThreadPoolExecutor
 
 REPO_ROOT = Path(__file__).resolve().parents[1]
 sys.path.insert(0, str(REPO_ROOT))
@@ -42,10 +43,10 @@ def main(argv=None):
 
     if args.limit:
         # If a limit is provided, fetch only up to that many candles per symbol.
-        data = {}
-        for s in symbols:
-            df = fetcher.fetch_ohlcv_safe(s, '1m', since=None, limit=args.limit)
-            data[s] = df
+        # These are independent network round-trips, so overlap them on a thread pool.
+        with ThreadPoolExecutor(max_workers=min(8, len(symbols)) or 1) as ex:
+            futs = {s: ex.submit(fetcher.fetch_ohlcv_safe, s, '1m', None, args.limit) for s in symbols}
+            data = {s: f.result() for s, f in futs.items()}
     else:
         data = fetcher.fetch_historical_data(symbols=symbols, timeframe='1m', days_back=args.days_back)
     manifest = fetcher.save_data(data, '1m')
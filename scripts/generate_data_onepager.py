@@ -3,61 +3,177 @@
 
 This script will look under `data/crypto/USDT/*` for per-symbol manifests
 (`manifest_1d.yaml`, `manifest_1h.yaml`). If a manifest is missing or
-incomplete it will fall back to reading the canonical CSV `crypto_<BASE>_USDT_<timeframe>.csv`.
+incomplete it will fall back to reading the canonical data file
+`crypto_<BASE>_USDT_<timeframe>.parquet` (or a legacy `.csv` of the same name).
 
 Output: `results/data_onepager.md`
 
 Emoticons are included in the generated report as requested.
 """
 from pathlib import Path
+import argparse
+import csv
+import functools
+import hashlib
+import os
 import yaml
-import pandas as pd
+import numpy as np
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.csv as pacsv
+import pyarrow.parquet as pq
 import textwrap
 from datetime import datetime
 
+# libyaml's C loader is much faster than the pure-Python one; fall back if PyYAML was built without it
+try:
+    from yaml import CSafeLoader as _YamlLoader
+except ImportError:
+    from yaml import SafeLoader as _YamlLoader
 
 REPO_ROOT = Path(__file__).resolve().parents[1]
 DATA_ROOT = REPO_ROOT / 'data' / 'crypto' / 'USDT'
 OUT_DIR = REPO_ROOT / 'results'
 OUT_DIR.mkdir(parents=True, exist_ok=True)
 OUT_FILE = OUT_DIR / 'data_onepager.md'
+# Fingerprint of the inputs behind the last written OUT_FILE (see _fingerprint)
+FP_FILE = OUT_DIR / '.onepager_fp'
+
+# Only these columns feed the one-pager stats; everything else is pruned at read time
+STATS_COLUMNS = ['datetime', 'close', 'low', 'high', 'volume']
+# float64 (not float32) so the 4-decimal figures in the report are exact
+STATS_TYPES = {c: pa.float64() for c in ('close', 'low', 'high', 'volume')}
+# Manifest keys that can only be recovered by scanning the whole CSV (start/end need two rows)
+FULL_SCAN_KEYS = ('rows', 'min_price', 'max_price', 'mean_volume')
+
+
+@functools.lru_cache(maxsize=4096)
+def _load_yaml_cached(path_str: str, mtime_ns: int, size: int) -> dict:
+    # mtime/size are part of the cache key only, so an edited manifest is re-parsed
+    with open(path_str, 'rb') as fh:
+        return yaml.load(fh, Loader=_YamlLoader) or {}
 
 
 def read_manifest(symbol_dir: Path, timeframe: str) -> dict | None:
     mfile = symbol_dir / f'manifest_{timeframe}.yaml'
-    if not mfile.exists():
-        return None
+    # a missing manifest surfaces as FileNotFoundError from stat(); no separate exists() call
     try:
-        with open(mfile, 'r', encoding='utf8') as fh:
-            return yaml.safe_load(fh) or {}
+        st = mfile.stat()
+        return _load_yaml_cached(str(mfile), st.st_mtime_ns, st.st_size)
     except Exception:
         return None
 
 
+def _data_file(symbol_dir: Path, base: str, timeframe: str) -> Path:
+    """Canonical per-symbol data file: the fetcher's Parquet, else a legacy CSV of the same name."""
+    parquet = symbol_dir / f'crypto_{base}_USDT_{timeframe}.parquet'
+    return parquet if parquet.exists() else parquet.with_suffix('.csv')
+
+
+def _read_parquet_columns(path: Path, columns: list[str]) -> pa.Table:
+    """Read `columns` from a Parquet file; ones it lacks come back all-null, floats as float64."""
+    names = set(pq.read_schema(path).names)
+    tbl = pq.read_table(path, columns=[c for c in columns if c in names])
+    for c in columns:
+        if c not in names:
+            tbl = tbl.append_column(c, pa.nulls(tbl.num_rows, STATS_TYPES.get(c, pa.string())))
+        elif c in STATS_TYPES:
+            tbl = tbl.set_column(tbl.schema.get_field_index(c), c, pc.cast(tbl[c], STATS_TYPES[c]))
+    return tbl
+
+
 def read_csv_stats(symbol_dir: Path, base: str, timeframe: str) -> dict | None:
-    csv_file = symbol_dir / f'crypto_{base}_USDT_{timeframe}.csv'
-    if not csv_file.exists():
-        return None
+    data_file = _data_file(symbol_dir, base, timeframe)
     try:
-        df = pd.read_csv(csv_file, parse_dates=['datetime'], index_col='datetime')
+        if data_file.suffix == '.parquet':
+            tbl = _read_parquet_columns(data_file, STATS_COLUMNS)
+        else:
+            # Arrow's multithreaded reader parses only the columns we need, with fixed
+            # types so no inference pass is needed; columns absent from the file come
+            # back as all-null so their stats resolve to None below
+            with pa.memory_map(str(data_file)) as src:
+                tbl = pacsv.read_csv(
+                    src,
+                    read_options=pacsv.ReadOptions(use_threads=True),
+                    convert_options=pacsv.ConvertOptions(
+                        include_columns=STATS_COLUMNS,
+                        include_missing_columns=True,
+                        column_types=STATS_TYPES,
+                    ),
+                )
     except Exception:
         return None
 
-    if df.empty:
+    if tbl.num_rows == 0:
         return None
 
     stats = {
-        'rows': int(len(df)),
-        'start': str(df.index.min()),
-        'end': str(df.index.max()),
-        'last_close': float(df['close'].iloc[-1]) if 'close' in df.columns else None,
-        'min_price': float(df['low'].min()) if 'low' in df.columns else None,
-        'max_price': float(df['high'].max()) if 'high' in df.columns else None,
-        'mean_volume': float(df['volume'].mean()) if 'volume' in df.columns else None,
+        'rows': int(tbl.num_rows),
+        'start': str(pc.min(tbl['datetime']).as_py()),
+        'end': str(pc.max(tbl['datetime']).as_py()),
+        'last_close': tbl['close'][-1].as_py(),
+        'min_price': pc.min(tbl['low']).as_py(),
+        'max_price': pc.max(tbl['high']).as_py(),
+        'mean_volume': pc.mean(tbl['volume']).as_py(),
     }
     return stats
 
 
+def _tail_line(path: Path, n: int = 4096) -> str:
+    """Return the last non-empty line of a text file by seeking from the end."""
+    with open(path, 'rb') as f:
+        f.seek(0, 2)
+        size = f.tell()
+        while True:
+            f.seek(max(0, size - n))
+            data = f.read().rstrip(b'\r\n')
+            # keep widening the window until it holds one complete line (or the whole file)
+            if n >= size or b'\n' in data:
+                break
+            n *= 2
+    return data.rsplit(b'\n', 1)[-1].rstrip(b'\r').decode('utf8')
+
+
+def read_csv_bounds(symbol_dir: Path, base: str, timeframe: str) -> dict | None:
+    """Cheap start/end/last_close from the first and last data rows only.
+
+    Canonical files are written sorted by datetime, so two rows are enough and
+    the rest of the file never has to be parsed (Parquet only decodes two columns).
+    """
+    data_file = _data_file(symbol_dir, base, timeframe)
+    if data_file.suffix == '.parquet':
+        try:
+            tbl = _read_parquet_columns(data_file, ['datetime', 'close'])
+        except Exception:
+            return None
+        if tbl.num_rows == 0:
+            return None
+        return {
+            'start': str(tbl['datetime'][0].as_py()),
+            'end': str(tbl['datetime'][-1].as_py()),
+            'last_close': tbl['close'][-1].as_py(),
+        }
+    csv_file = data_file
+    try:
+        with open(csv_file, 'r', encoding='utf8', newline='') as fh:
+            reader = csv.reader(fh)
+            header = next(reader)
+            first = next(reader, None)
+        if first is None:
+            return None
+        last = next(csv.reader([_tail_line(csv_file)]))
+        dt_idx = header.index('datetime')
+        close_idx = header.index('close') if 'close' in header else None
+    except Exception:
+        return None
+
+    return {
+        'start': first[dt_idx],
+        'end': last[dt_idx],
+        'last_close': float(last[close_idx]) if close_idx is not None and last[close_idx] else None,
+    }
+
+
 def gather_symbol_summary(symbol_dir: Path) -> dict:
     base = symbol_dir.name
     out = {'symbol': f'{base}/USDT', 'base': base, 'timeframes': {}}
@@ -74,19 +190,23 @@ def gather_symbol_summary(symbol_dir: Path) -> dict:
                 'mean_volume': manifest.get('mean_volume') or manifest.get('avg_volume') or None,
             }
 
-            # If any key is missing, try to read canonical CSV to fill values
-            missing = any(v is None for v in out_tf.values())
-            if missing:
+            # If any key is missing, try to read the canonical data file to fill values.
+            # When only the date bounds are missing, two rows of it suffice.
+            if any(out_tf[k] is None for k in FULL_SCAN_KEYS):
                 csv_stats = read_csv_stats(symbol_dir, base, tf)
-                if csv_stats:
-                    # prefer manifest values, but fill blanks from CSV
-                    for k, v in csv_stats.items():
-                        if out_tf.get(k) in (None, '—') and v is not None:
-                            # map csv_stats keys to manifest keys when names differ
-                            if k == 'last_close':
-                                out_tf['last_close'] = v
-                            else:
-                                out_tf[k] = v
+            elif out_tf['start'] is None or out_tf['end'] is None:
+                csv_stats = read_csv_bounds(symbol_dir, base, tf)
+            else:
+                csv_stats = None
+            if csv_stats:
+                # prefer manifest values, but fill blanks from CSV
+                for k, v in csv_stats.items():
+                    if out_tf.get(k) in (None, '—') and v is not None:
+                        # map csv_stats keys to manifest keys when names differ
+                        if k == 'last_close':
+                            out_tf['last_close'] = v
+                        else:
+                            out_tf[k] = v
 
             out['timeframes'][tf] = out_tf
         else:
@@ -98,104 +218,153 @@ def gather_symbol_summary(symbol_dir: Path) -> dict:
     return out
 
 
-def format_onepager(summaries: list[dict]) -> str:
-    now = datetime.utcnow().strftime('%Y-%m-%d %H:%M UTC')
-    header = f"# Data one-pager — crypto dataset 📊\n\nGenerated: {now}\n\n"
-
-    overview_lines = [
-        f"- Symbols scanned: {len(summaries)} 🔎",
-        f"- Data root: `{DATA_ROOT.relative_to(REPO_ROOT)}`",
-        "",
-    ]
-    body = []
-    # Helper for formatting numbers
-    def fmt(x, ndigits=4):
+def _as_float(x) -> float | None:
+    try:
+        return float(x)
+    except Exception:
+        return None
+
+
+def fmt_column(values: list, ndigits: int = 4) -> list[str]:
+    """Format a column of prices/counts: ints get thousands separators, floats keep up
+    to `ndigits` decimals with trailing zeros stripped."""
+    out = []
+    for x in values:
         if x is None:
-            return '—'
-        if isinstance(x, (int,)):
-            return f"{x:,}"
-        try:
-            f = float(x)
-        except Exception:
-            return str(x)
-        # large numbers use comma formatting
-        if abs(f) >= 1_000:
-            s = f"{f:,.{ndigits}f}"
-            # strip trailing zeros and trailing dot
-            s = s.rstrip('0').rstrip('.')
-            return s
-        # small numbers keep up to ndigits significant digits
-        return f"{f:.{ndigits}f}".rstrip('0').rstrip('.')
-
-    def fmt_vol(v):
+            out.append('—')
+        elif isinstance(x, int):
+            out.append(f"{x:,}")
+        elif (f := _as_float(x)) is None:
+            out.append(str(x))
+        else:
+            # large numbers use comma formatting; strip trailing zeros and trailing dot
+            spec = f",.{ndigits}f" if abs(f) >= 1_000 else f".{ndigits}f"
+            out.append(format(f, spec).rstrip('0').rstrip('.'))
+    return out
+
+
+# Human-readable SI-ish volume units, picked per value with one vectorized bucket lookup
+_VOL_DIVISORS = np.array([1e9, 1e6, 1e3, 1.0])
+_VOL_SUFFIXES = ('B', 'M', 'K', '')
+
+
+def fmt_vol_column(values: list) -> list[str]:
+    nums = np.array([np.nan if (f := _as_float(v)) is None else f for v in values], dtype=float)
+    mag = np.abs(nums)
+    bucket = np.select([mag >= 1e9, mag >= 1e6, mag >= 1e3], [0, 1, 2], default=3)
+    scaled = (nums / _VOL_DIVISORS[bucket]).tolist()
+    out = []
+    for v, x, b in zip(values, scaled, bucket.tolist()):
         if v is None:
-            return '—'
-        try:
-            v = float(v)
-        except Exception:
-            return str(v)
-        # Human-readable SI-ish units
-        abs_v = abs(v)
-        if abs_v >= 1e9:
-            return f"{v/1e9:.2f}B"
-        if abs_v >= 1e6:
-            return f"{v/1e6:.2f}M"
-        if abs_v >= 1e3:
-            return f"{v/1e3:.2f}K"
-        return f"{v:.2f}"
+            out.append('—')
+        elif _as_float(v) is None:
+            out.append(str(v))
+        else:
+            out.append(f"{x:.2f}{_VOL_SUFFIXES[b]}")
+    return out
+
+
+def iter_onepager(summaries: list[dict]):
+    """Yield the one-pager markdown line by line (without trailing newlines)."""
+    # sort once here rather than once per timeframe table
+    summaries = sorted(summaries, key=lambda x: x['base'])
+    now = datetime.utcnow().strftime('%Y-%m-%d %H:%M UTC')
+    yield "# Data one-pager — crypto dataset 📊"
+    yield ""
+    yield f"Generated: {now}"
+    yield ""
+
+    yield f"- Symbols scanned: {len(summaries)} 🔎"
+    yield f"- Data root: `{DATA_ROOT.relative_to(REPO_ROOT)}`"
+    yield ""
 
     # Build two aggregated tables: 1h and 1d. Each table has one row per symbol.
-    def build_table_for_timeframe(tf: str) -> list[str]:
-        lines: list[str] = []
-        lines.append(f"## {tf} summary ✨")
-        lines.append("| ticker | rows | start | end | last | min | max | mean_vol |")
-        lines.append("|:---|---:|:---|:---|---:|---:|---:|---:|")
-        for s in sorted(summaries, key=lambda x: x['base']):
-            info = s['timeframes'].get(tf)
+    # Cells are formatted column-wise so each column goes through one batch formatter.
+    def build_table_for_timeframe(tf: str):
+        yield f"## {tf} summary ✨"
+        yield "| ticker | rows | start | end | last | min | max | mean_vol |"
+        yield "|:---|---:|:---|:---|---:|---:|---:|---:|"
+        infos = [s['timeframes'].get(tf) or {} for s in summaries]
+        rows = fmt_column([i.get('rows') for i in infos])
+        last = fmt_column([i.get('last_close') or i.get('last') for i in infos])
+        minp = fmt_column([i.get('min_price') for i in infos])
+        maxp = fmt_column([i.get('max_price') for i in infos])
+        mv = fmt_vol_column([i.get('mean_volume') for i in infos])
+        for k, (s, info) in enumerate(zip(summaries, infos)):
             ticker = s['symbol']
             if not info:
-                lines.append(f"| {ticker} | — | — | — | — | — | — | — |")
+                yield f"| {ticker} | — | — | — | — | — | — | — |"
                 continue
-            rows = fmt(info.get('rows'))
             start = info.get('start') or '—'
             end = info.get('end') or '—'
-            last = fmt(info.get('last_close') or info.get('last'))
-            minp = fmt(info.get('min_price'))
-            maxp = fmt(info.get('max_price'))
-            mv = fmt_vol(info.get('mean_volume'))
-            lines.append(f"| {ticker} | {rows} | {start} | {end} | {last} | {minp} | {maxp} | {mv} |")
-        return lines
-
-    # append 1h table first, then 1d table
-    body.extend(build_table_for_timeframe('1h'))
-    body.append('')
-    body.extend(build_table_for_timeframe('1d'))
-    body.append('')
+            yield f"| {ticker} | {rows[k]} | {start} | {end} | {last[k]} | {minp[k]} | {maxp[k]} | {mv[k]} |"
+
+    # 1h table first, then 1d table
+    yield from build_table_for_timeframe('1h')
+    yield ''
+    yield from build_table_for_timeframe('1d')
+    yield ''
 
     footer = textwrap.dedent(
         """
         ---
         Notes:
-        - This report reads `manifest_<timeframe>.yaml` when present, otherwise falls back to the canonical CSV.
+        - This report reads `manifest_<timeframe>.yaml` when present, otherwise falls back to the canonical Parquet/CSV data file.
         - If you want richer charts, run the summary scripts under `src/utils` to generate combined CSVs and plots.
         """
     )
+    yield from footer.splitlines()
 
-    return header + '\n'.join(overview_lines) + '\n' + '\n'.join(body) + '\n' + footer
 
+def format_onepager(summaries: list[dict]) -> str:
+    return ''.join(line + '\n' for line in iter_onepager(summaries))
+
+
+def _fingerprint(symbol_dirs: list[Path]) -> str:
+    """Hash the set of symbol dirs, (path, mtime_ns, size) of every manifest/data file the one-pager
+    reads in them, plus this script. A new or removed symbol dir changes it even while still empty."""
+    h = hashlib.blake2b(digest_size=16)
+    st = os.stat(__file__)
+    h.update(f"{__file__}:{st.st_mtime_ns}:{st.st_size}\n".encode())
+    for d in symbol_dirs:
+        h.update(f"dir:{d}\n".encode())
+        with os.scandir(d) as it:
+            entries = sorted((e for e in it if e.name.endswith(('.yaml', '.csv', '.parquet')) and e.is_file()),
+                             key=lambda e: e.name)
+        for e in entries:
+            st = e.stat()
+            h.update(f"{e.path}:{st.st_mtime_ns}:{st.st_size}\n".encode())
+    return h.hexdigest()
+
+
+def main(argv=None):
+    p = argparse.ArgumentParser(description='Generate results/data_onepager.md from crypto manifests')
+    p.add_argument('--force', action='store_true', help='Regenerate even if no manifest or data file changed')
+    args = p.parse_args(argv)
 
-def main():
     if not DATA_ROOT.exists():
         print(f"No data directory found at {DATA_ROOT}. Nothing to summarize.")
         return 1
 
-    summaries = []
-    for symbol_dir in sorted([p for p in DATA_ROOT.iterdir() if p.is_dir()]):
-        summaries.append(gather_symbol_summary(symbol_dir))
+    # scandir's cached d_type avoids a stat() per entry for the is_dir check
+    with os.scandir(DATA_ROOT) as it:
+        symbol_dirs = sorted((Path(e.path) for e in it if e.is_dir(follow_symlinks=False)), key=lambda p: p.name)
+    # Skip the whole read/format pass when no input changed since the last run
+    fp = _fingerprint(symbol_dirs)
+    if not args.force and OUT_FILE.exists():
+        try:
+            if FP_FILE.read_text(encoding='utf8') == fp:
+                print(f"One-pager up to date: {OUT_FILE}")
+                return 0
+        except OSError:
+            pass
+    # A handful of small manifests per symbol: a plain in-process map (order follows symbol_dirs)
+    # keeps _load_yaml_cached warm and costs nothing to start, unlike a process pool
+    summaries = list(map(gather_symbol_summary, symbol_dirs))
 
-    md = format_onepager(summaries)
     with open(OUT_FILE, 'w', encoding='utf8') as fh:
-        fh.write(md)
+        fh.writelines(line + '\n' for line in iter_onepager(summaries))
+    FP_FILE.write_text(fp, encoding='utf8')
 
     print(f"Wrote one-pager to: {OUT_FILE}")
     return 0
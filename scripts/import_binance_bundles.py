@@ -17,16 +17,37 @@ from pathlib import Path
 import argparse
 import zipfile
 import csv
-import io
+import hashlib
+import os
+import re
 import sys
+import numpy as np
 import pandas as pd
+import pyarrow as pa
+import pyarrow.csv as pacsv
 import yaml
-from datetime import datetime
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime, timezone
+
+# libyaml's C emitter when available; same output as safe_dump, much faster
+try:
+    from yaml import CSafeDumper as _YamlDumper
+except ImportError:
+    from yaml import SafeDumper as _YamlDumper
 
 
 REPO_ROOT = Path(__file__).resolve().parents[1]
 DATA_ROOT = REPO_ROOT / 'data' / 'crypto' / 'USDT'
 
+# Binance kline bundles have 12 unnamed columns; only the first six are imported.
+# Arrow autogenerates f0..f11, and fixed types spare it a per-file inference pass.
+_KLINE_NAMES = ['open_time', 'open', 'high', 'low', 'close', 'volume']
+_KLINE_COLUMNS = [f'f{i}' for i in range(len(_KLINE_NAMES))]
+_KLINE_TYPES = {'f0': pa.int64(), **{c: pa.float64() for c in _KLINE_COLUMNS[1:]}}
+_DATE_RE = re.compile(r"(\d{4}-\d{2}(?:-\d{2})?)")
+# Column dtypes of the month partitions we write, so re-reads skip type inference
+_PARTITION_DTYPES = {c: 'float64' for c in _KLINE_NAMES[1:]}
+
 
 def find_bundle_files(bundle_dir: Path, timeframe: str, symbol: str):
     """Find bundle files for a symbol across daily and monthly bundle folders.
@@ -40,78 +61,109 @@ def find_bundle_files(bundle_dir: Path, timeframe: str, symbol: str):
     return sorted(files)
 
 
+def _read_kline_table(fh) -> pa.Table:
+    """Parse one kline CSV stream with Arrow's multithreaded reader (first six columns only)."""
+    # Some bundles ship a header row; data rows always start with a digit. peek() looks at
+    # the buffered bytes without consuming them, so ZIP members aren't rewound/re-inflated.
+    skip = 0 if fh.peek(1)[:1].isdigit() else 1
+    return pacsv.read_csv(
+        fh,
+        read_options=pacsv.ReadOptions(autogenerate_column_names=True, skip_rows=skip, block_size=8 << 20),
+        convert_options=pacsv.ConvertOptions(include_columns=_KLINE_COLUMNS, column_types=_KLINE_TYPES),
+    )
+
+
 def read_bundle_csv(path: Path) -> pd.DataFrame:
     """Read one bundle file (CSV or ZIP). If ZIP contains multiple CSVs, concatenate them.
 
     Returns a DataFrame indexed by datetime (UTC).
     """
     frames = []
-    if path.suffix.lower() == '.zip':
-        with zipfile.ZipFile(path, 'r') as z:
-            names = [n for n in z.namelist() if n.lower().endswith('.csv')]
-            if not names:
-                raise RuntimeError(f"No CSV found inside {path}")
-            for name in names:
-                with z.open(name) as fh:
-                    text = io.TextIOWrapper(fh, encoding='utf8')
-                    df = pd.read_csv(text, header=None)
-                    frames.append(df)
-    else:
-        df = pd.read_csv(path, header=None)
-        frames.append(df)
+    try:
+        if path.suffix.lower() == '.zip':
+            with zipfile.ZipFile(path, 'r') as z:
+                names = [n for n in z.namelist() if n.lower().endswith('.csv')]
+                if not names:
+                    raise RuntimeError(f"No CSV found inside {path}")
+                for name in names:
+                    with z.open(name) as fh:
+                        frames.append(_read_kline_table(fh))
+        else:
+            with open(path, 'rb') as fh:
+                frames.append(_read_kline_table(fh))
+    except pa.ArrowInvalid as e:
+        raise RuntimeError(f"Unexpected CSV format in {path}: {e}") from e
 
     if not frames:
         raise RuntimeError(f"No CSV frames in {path}")
 
-    df = pd.concat(frames, axis=0, ignore_index=True)
-    if df.shape[1] < 6:
-        raise RuntimeError(f"Unexpected CSV format in {path}")
-    df = df.iloc[:, :6]
-    df.columns = ['open_time', 'open', 'high', 'low', 'close', 'volume']
-    # coerce open_time to numeric and drop invalid rows
-    df['open_time'] = pd.to_numeric(df['open_time'], errors='coerce')
-    df = df.dropna(subset=['open_time'])
+    df = pa.concat_tables(frames).to_pandas(split_blocks=True, self_destruct=True)
+    df.columns = _KLINE_NAMES
+    # open_time is already int64 from the typed read; it only turns float when some rows
+    # had an empty open_time, and those are dropped
+    if df['open_time'].hasnans:
+        df = df.dropna(subset=['open_time'])
+    ot = df['open_time'].to_numpy(dtype=np.int64)
     # open_time may be in microseconds, milliseconds or seconds depending on bundle.
-    df['open_time'] = df['open_time'].astype('int64')
-    max_ot = df['open_time'].abs().max() if not df['open_time'].empty else 0
-    if max_ot > 1e14:
+    max_ot = int(np.abs(ot).max()) if ot.size else 0
+    if max_ot > 10**14:
         unit = 'us'
-    elif max_ot > 1e11:
+    elif max_ot > 10**11:
         unit = 'ms'
     else:
         unit = 's'
-    df['datetime'] = pd.to_datetime(df['open_time'], unit=unit, utc=True, errors='coerce')
-    df = df.dropna(subset=['datetime'])
-    df = df.set_index('datetime')
-    for c in ['open', 'high', 'low', 'close', 'volume']:
-        df[c] = pd.to_numeric(df[c], errors='coerce')
-    df = df[['open', 'high', 'low', 'close', 'volume']]
-    return df
+    dt = pd.to_datetime(ot, unit=unit, utc=True, errors='coerce')
+    df.index = pd.DatetimeIndex(dt, name='datetime')
+    if dt.hasnans:
+        df = df[~dt.isna()]
+    # prices/volume are float64 from the typed Arrow read (bad cells fail the parse), so no re-coercion
+    return df[['open', 'high', 'low', 'close', 'volume']]
+
+
+def _utc_now_iso() -> str:
+    return datetime.now(timezone.utc).isoformat(timespec='seconds')
 
 
 def month_from_filename(path: Path):
     """Extract year-month string YYYY-MM from filename (daily or monthly)."""
-    import re
-    name = path.name
-    m = re.search(r"(\d{4}-\d{2}(?:-\d{2})?)", name)
+    # Binance names are SYMBOL-TF-YYYY-MM[-DD]; slice the date off the stem without a regex
+    parts = path.stem.split('-')
+    if len(parts) >= 4:
+        y, mo = (parts[-2], parts[-1]) if len(parts[-2]) == 4 else (parts[-3], parts[-2])
+        if len(y) == 4 and len(mo) == 2 and y.isdigit() and mo.isdigit():
+            return f"{y}-{mo}"
+    m = _DATE_RE.search(path.name)
     if not m:
         return None
-    date_part = m.group(1)
-    if len(date_part) >= 7:
-        return date_part[:7]
-    return None
+    return m.group(1)[:7]
+
+
+class _HashSink:
+    """Write-only file-like object that feeds everything written to it into a hash.
+
+    If a binary file handle is given, the same bytes are also written there (tee).
+    """
+
+    def __init__(self, h, fh=None):
+        self.h = h
+        self.fh = fh
+
+    def write(self, b):
+        data = b.encode('utf8') if isinstance(b, str) else b
+        self.h.update(data)
+        if self.fh is not None:
+            self.fh.write(data)
+        return len(b)
 
 
 def sha256_of_df_csv_bytes(df: pd.DataFrame) -> str:
-    import hashlib
-    bio = io.BytesIO()
-    df.to_csv(bio, index_label='datetime')
-    bio.seek(0)
-    h = hashlib.sha256(bio.read()).hexdigest()
-    return h
+    # Stream the CSV text straight into the hash instead of materialising it in a BytesIO
+    h = hashlib.sha256()
+    df.to_csv(_HashSink(h), index_label='datetime')
+    return h.hexdigest()
 
 
-def write_month_partition(df: pd.DataFrame, base: str, timeframe: str, year_month: str, bundle_path: Path, dry_run: bool = False, force: bool = False) -> dict:
+def write_month_partition(df: pd.DataFrame, base: str, timeframe: str, year_month: str, bundle_path: Path, dry_run: bool = False, force: bool = False, updated_ts: str | None = None) -> dict:
     """Write a month's data to partition path: DATA_ROOT/<base>/<timeframe>/<YYYY>/<MM>/crypto_<base>_USDT_<timeframe>.csv
 
     Returns manifest info for the month.
@@ -121,22 +173,48 @@ def write_month_partition(df: pd.DataFrame, base: str, timeframe: str, year_mont
     symbol_dir.mkdir(parents=True, exist_ok=True)
     out_path = symbol_dir / f'crypto_{base}_USDT_{timeframe}.csv'
 
-    # existing data for that month
-    if out_path.exists() and not dry_run:
-        existing = pd.read_csv(out_path, parse_dates=['datetime'], index_col='datetime')
+    # existing data for that month; with --force it is about to be replaced, so don't parse it
+    if force or dry_run or not out_path.exists():
+        existing = None
     else:
-        existing = pd.DataFrame(columns=['open','high','low','close','volume'])
-
-    combined = pd.concat([existing, df]) if not existing.empty else df.copy()
-    combined = combined[~combined.index.duplicated(keep='last')]
-    combined = combined.sort_index()
-
-    if not dry_run:
+        existing = pd.read_csv(out_path, index_col='datetime', dtype=_PARTITION_DTYPES, engine='c')
+        existing.index = pd.to_datetime(existing.index, format='ISO8601', utc=True)
+
+    # Append-only update (the common daily case): every new row is after the partition's
+    # last row, so the existing bytes can stay as they are and only the new rows are written
+    has_existing = existing is not None and not existing.empty
+    append = has_existing and not df.empty and df.index.min() > existing.index.max()
+    if append:
+        new_rows = df[~df.index.duplicated(keep='last')].sort_index()
+        combined = pd.concat([existing, new_rows], copy=False)
+    else:
+        # One concat, then dedup (new rows win) and sort; the mask already yields a new
+        # frame, so the new-partition path needs no defensive df.copy()
+        combined = pd.concat([existing, df], copy=False) if has_existing else df
+        combined = combined[~combined.index.duplicated(keep='last')].sort_index()
+
+    if append:
+        # hash the untouched prefix straight from disk, then tee the appended rows
+        h = hashlib.sha256()
+        with open(out_path, 'r+b') as fh:
+            last = b''
+            for block in iter(lambda: fh.read(1 << 20), b''):
+                h.update(block)
+                last = block
+            if not last.endswith(b'\n'):
+                _HashSink(h, fh).write(b'\n')
+            new_rows.to_csv(_HashSink(h, fh), header=False)
+        checksum = h.hexdigest()
+    elif not dry_run:
         if out_path.exists() and force:
             out_path.unlink()
-        combined.to_csv(out_path, index_label='datetime')
-
-    checksum = sha256_of_df_csv_bytes(combined) if not combined.empty else None
+        # serialize once: the CSV text goes to the file and into the hash in the same pass
+        h = hashlib.sha256()
+        with open(out_path, 'wb') as fh:
+            combined.to_csv(_HashSink(h, fh), index_label='datetime')
+        checksum = h.hexdigest() if not combined.empty else None
+    else:
+        checksum = sha256_of_df_csv_bytes(combined) if not combined.empty else None
     info = {
         'filename': out_path.name,
         'rows': int(len(combined)),
@@ -155,24 +233,26 @@ def write_month_partition(df: pd.DataFrame, base: str, timeframe: str, year_mont
         'start_date': info['start_date'],
         'end_date': info['end_date'],
         'sha256': info['sha256'],
-        'updated': datetime.utcnow().isoformat(),
+        'updated': updated_ts or _utc_now_iso(),
     }
     if not combined.empty:
-        # per-field stats
+        # per-field stats: one agg call instead of six reductions per column
+        cols = ['open', 'high', 'low', 'close', 'volume']
+        stats = combined[cols].agg(['min', 'max', 'mean', 'median', 'std', 'count'])
         fields = {}
-        for col in ['open','high','low','close','volume']:
-            if col in combined.columns:
-                ser = combined[col].dropna()
-                fields[col] = {
-                    'name': col,
-                    'description': 'Open/High/Low/Close/Volume for the interval' if col!='volume' else 'Traded volume during the interval',
-                    'min': float(ser.min()) if not ser.empty else None,
-                    'max': float(ser.max()) if not ser.empty else None,
-                    'mean': float(ser.mean()) if not ser.empty else None,
-                    'median': float(ser.median()) if not ser.empty else None,
-                    'std': float(ser.std()) if not ser.empty else None,
-                    'nulls': int(len(combined) - len(ser)),
-                }
+        for col in cols:
+            st = stats[col]
+            count = int(st['count'])
+            fields[col] = {
+                'name': col,
+                'description': 'Open/High/Low/Close/Volume for the interval' if col!='volume' else 'Traded volume during the interval',
+                'min': float(st['min']) if count else None,
+                'max': float(st['max']) if count else None,
+                'mean': float(st['mean']) if count else None,
+                'median': float(st['median']) if count else None,
+                'std': float(st['std']) if count else None,
+                'nulls': int(len(combined) - count),
+            }
         # last close and return
         first_close = float(combined['close'].iloc[0])
         last_close = float(combined['close'].iloc[-1])
@@ -181,31 +261,58 @@ def write_month_partition(df: pd.DataFrame, base: str, timeframe: str, year_mont
         mdata['fields'] = fields
         mdata['insights'] = {
             'price_range': {
-                'min_close': float(combined['close'].min()),
-                'max_close': float(combined['close'].max()),
+                'min_close': float(stats.at['min', 'close']),
+                'max_close': float(stats.at['max', 'close']),
             },
-            'avg_volume': float(combined['volume'].mean()),
+            'avg_volume': float(stats.at['mean', 'volume']),
         }
         mdata['last_close'] = last_close
         mdata['total_return_pct'] = total_return_pct
     if not dry_run:
         with open(mfile, 'w', encoding='utf8') as fh:
-            yaml.safe_dump(mdata, fh)
+            yaml.dump(mdata, fh, Dumper=_YamlDumper, default_flow_style=False)
 
     return info
 
 
-def write_manifest(symbol_dir: Path, timeframe: str, info: dict, dry_run: bool = False):
+def write_manifest(symbol_dir: Path, timeframe: str, info: dict, dry_run: bool = False, updated_ts: str | None = None):
     mfile = symbol_dir / f'manifest_{timeframe}.yaml'
     data = {
         'rows': info.get('rows'),
         'start': info.get('start_date'),
         'end': info.get('end_date'),
-        'updated': datetime.utcnow().isoformat(),
+        'updated': updated_ts or _utc_now_iso(),
     }
     if not dry_run:
         with open(mfile, 'w', encoding='utf8') as fh:
-            yaml.safe_dump(data, fh)
+            yaml.dump(data, fh, Dumper=_YamlDumper, default_flow_style=False)
+
+
+def _process_month(sym: str, base: str, timeframe: str, mon: str, fps: list[Path], dry_run: bool = False,
+                   force: bool = False, updated_ts: str | None = None) -> dict | None:
+    """Import one month for one symbol; top-level so ProcessPoolExecutor can pickle it."""
+    # prefer monthly file (single .zip with YYYY-MM) if present:
+    # detect any file whose stem ends with the month (YYYY-MM)
+    monthly_file = next((f for f in fps if f.stem.endswith(mon)), None)
+    try:
+        if monthly_file:
+            df = read_bundle_csv(monthly_file)
+            return write_month_partition(df, base, timeframe, mon, monthly_file, dry_run=dry_run, force=force, updated_ts=updated_ts)
+        # combine daily files for that month
+        dfs = []
+        for f in sorted(fps):
+            try:
+                dfs.append(read_bundle_csv(f))
+            except Exception as e:
+                print(f"Failed to read {f}: {e}")
+        if not dfs:
+            return None
+        # concat once per month; write_month_partition dedups (keep='last') and sorts
+        big = pd.concat(dfs, copy=False)
+        return write_month_partition(big, base, timeframe, mon, fps[0], dry_run=dry_run, force=force, updated_ts=updated_ts)
+    except Exception as e:
+        print(f"Failed to import month {mon} for {sym}: {e}")
+        return None
 
 
 def main(argv=None):
@@ -215,10 +322,13 @@ def main(argv=None):
     p.add_argument('--symbols', nargs='*', help='Symbols to import (e.g. BTC ETH). If omitted, infer from bundle dir')
     p.add_argument('--dry-run', action='store_true', help='Do not write files; just show plan')
     p.add_argument('--force', action='store_true', help='Overwrite existing month partitions')
+    p.add_argument('--workers', type=int, default=None, help='Worker processes for month imports (default: CPU count)')
     args = p.parse_args(argv)
 
     bundle_dir = Path(args.bundle_dir)
     tf = args.timeframe
+    # one 'updated' stamp for every manifest written by this run
+    run_ts = _utc_now_iso()
 
     if args.symbols:
         symbols = [s.upper() for s in args.symbols]
@@ -236,7 +346,9 @@ def main(argv=None):
                 if sym not in symbols:
                     symbols.append(sym)
 
-    plan = []
+    # Plan every (symbol, month) first; months touch disjoint partitions, so they are
+    # parsed and written in parallel worker processes
+    planned = []
     for sym in symbols:
         base = sym.replace('USDT','') if sym.endswith('USDT') else sym
         files = find_bundle_files(bundle_dir, tf, sym)
@@ -252,34 +364,26 @@ def main(argv=None):
                 print(f"Skipping unknown filename pattern: {fpath}")
                 continue
             months.setdefault(mon, []).append(fpath)
+        planned.append((sym, base, sorted(months.items())))
 
-        # for each month, prefer monthly file (single .zip with YYYY-MM) if present
-        month_infos = {}
-        for mon, fps in sorted(months.items()):
-            # detect any file whose stem ends with the month (YYYY-MM)
-            monthly_file = next((f for f in fps if f.stem.endswith(mon)), None)
-            try:
-                if monthly_file:
-                    df = read_bundle_csv(monthly_file)
-                    info = write_month_partition(df, base, tf, mon, monthly_file, dry_run=args.dry_run, force=args.force)
-                else:
-                    # combine daily files for that month
-                    dfs = []
-                    for f in sorted(fps):
-                        try:
-                            dfs.append(read_bundle_csv(f))
-                        except Exception as e:
-                            print(f"Failed to read {f}: {e}")
-                    if not dfs:
-                        continue
-                    big = pd.concat(dfs)
-                    big = big[~big.index.duplicated(keep='last')]
-                    info = write_month_partition(big, base, tf, mon, fps[0], dry_run=args.dry_run, force=args.force)
-                month_infos[mon] = info
-                plan.append((sym, mon, info))
-            except Exception as e:
-                print(f"Failed to import month {mon} for {sym}: {e}")
-
+    plan = []
+    jobs = [(sym, base, mon, fps) for sym, base, months in planned for mon, fps in months]
+    workers = max(1, min(args.workers or os.cpu_count() or 1, len(jobs) or 1))
+    with ProcessPoolExecutor(max_workers=workers) as ex:
+        futures = [
+            ex.submit(_process_month, sym, base, tf, mon, fps, dry_run=args.dry_run, force=args.force, updated_ts=run_ts)
+            for sym, base, mon, fps in jobs
+        ]
+        # results are consumed in submission order so the report stays sorted by symbol/month
+        results = [f.result() for f in futures]
+
+    by_symbol = {}
+    for (sym, base, mon, _), info in zip(jobs, results):
+        if info is not None:
+            by_symbol.setdefault((sym, base), {})[mon] = info
+            plan.append((sym, mon, info))
+
+    for (sym, base), month_infos in by_symbol.items():
         # after processing months, write yearly manifest(s)
         if month_infos and not args.dry_run:
             # group by year
@@ -292,7 +396,7 @@ def main(argv=None):
                 ydata = {
                     'year': y,
                     'months': {},
-                    'updated': datetime.utcnow().isoformat(),
+                    'updated': run_ts,
                 }
                 total_rows = 0
                 for mon, info in months_map.items():
@@ -305,7 +409,7 @@ def main(argv=None):
                     total_rows += info.get('rows', 0) or 0
                 ydata['rows'] = total_rows
                 with open(yfile, 'w', encoding='utf8') as fh:
-                    yaml.safe_dump(ydata, fh)
+                    yaml.dump(ydata, fh, Dumper=_YamlDumper, default_flow_style=False)
 
     # report
     for item in plan:
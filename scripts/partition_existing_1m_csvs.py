@@ -1,59 +1,145 @@
 #!/usr/bin/env python3
-"""Partition existing 1m CSVs into year/month folders.
+"""Partition existing 1m files into year/month folders.
 
-This script scans `data/crypto/USDT/*/` for files named like
-`crypto_<BASE>_USDT_1m.csv` and writes partitioned CSVs to
+This script scans `data/crypto/USDT/*/` for the canonical 1m file of each symbol:
+`crypto_<BASE>_USDT_1m.parquet` (what the fetcher writes) or, for older trees, a legacy
+`crypto_<BASE>_USDT_1m.csv`. Parquet sources are partitioned to
+`data/crypto/USDT/<BASE>/1m/<YYYY>/<MM>/crypto_<BASE>_USDT_1m.parquet`, CSVs to
 `data/crypto/USDT/<BASE>/1m/<YYYY>/<MM>/crypto_<BASE>_USDT_1m.csv`.
 
-It reads the source CSV in chunks so it can handle large files.
+It streams the source in record batches (pyarrow) so it can handle large files.
 Use --dry-run to only print planned writes.
 """
 from __future__ import annotations
 from pathlib import Path
 import argparse
-import pandas as pd
+import csv
+import io
 import sys
 from datetime import datetime
 import math
+import numpy as np
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.csv as pacsv
+import pyarrow.parquet as pq
 
 REPO_ROOT = Path(__file__).resolve().parents[1]
 DATA_ROOT = REPO_ROOT / 'data' / 'crypto' / 'USDT'
 
 
-def infer_timestamp_col(df: pd.DataFrame) -> str | None:
-    candidates = ['timestamp', 'datetime', 'open_time', 'openTime', 'open_time_ms']
-    for c in candidates:
-        if c in df.columns:
+TS_CANDIDATES = ('timestamp', 'datetime', 'open_time', 'openTime', 'open_time_ms')
+
+
+def infer_timestamp_col(names: list[str], first_row: list[str]) -> str | None:
+    for c in TS_CANDIDATES:
+        if c in names:
             return c
-    # otherwise pick first numeric/int-like column
-    for c in df.columns:
-        if pd.api.types.is_integer_dtype(df[c]) or pd.api.types.is_float_dtype(df[c]):
-            # heuristic: epoch ms if large numbers
-            sample = df[c].dropna().iloc[0] if len(df[c].dropna())>0 else None
-            if sample is None:
-                continue
-            if isinstance(sample, (int,)) and sample > 1e11:
-                return c
+    # otherwise pick first integer-like column holding epoch ms
+    for name, val in zip(names, first_row):
+        if val.isdigit() and int(val) > 1e11:
+            return name
     return None
 
 
-def to_datetime_series(s: pd.Series) -> pd.Series:
-    # if already datetime, return
-    if pd.api.types.is_datetime64_any_dtype(s):
-        return s.dt.tz_localize(None)
-    # integers likely epoch ms
-    if pd.api.types.is_integer_dtype(s) or pd.api.types.is_float_dtype(s):
-        # treat as ms if >1e11 else seconds
-        if s.dropna().empty:
-            return pd.to_datetime(s, unit='ms', utc=True).dt.tz_localize(None)
-        sample = float(s.dropna().iloc[0])
-        unit = 'ms' if sample > 1e11 else 's'
-        return pd.to_datetime(s, unit=unit, utc=True).dt.tz_localize(None)
-    # otherwise try to parse strings
-    return pd.to_datetime(s, utc=True).dt.tz_localize(None)
+def to_timestamps(col: pa.Array) -> pa.Array:
+    """Parse a timestamp column read as text: epoch s/ms numbers or datetime strings (UTC)."""
+    try:
+        nums = pc.cast(pc.cast(col, pa.float64()), pa.int64(), safe=False)
+    except pa.ArrowInvalid:
+        try:
+            return pc.cast(col, pa.timestamp('ns', tz='UTC'))
+        except pa.ArrowInvalid:
+            # naive datetimes are taken as UTC
+            return pc.cast(col, pa.timestamp('ns'))
+    # treat as ms if >1e11 else seconds
+    mx = pc.max(nums).as_py()
+    unit = 'ms' if mx is not None and mx > 1e11 else 's'
+    return pc.cast(nums, pa.timestamp(unit))
+
+
+def month_codes(ts: pa.Array) -> np.ndarray:
+    """YYYYMM code per row (0 for null timestamps) via numpy datetime64 month arithmetic."""
+    # int64 epoch -> timestamp is a zero-copy reinterpretation, so this views the raw values
+    dt = ts.to_numpy(zero_copy_only=False)
+    months = dt.astype('datetime64[M]').astype(np.int64)  # months since 1970-01
+    codes = (months // 12 + 1970) * 100 + months % 12 + 1
+    codes[np.isnat(dt)] = 0
+    return codes
+
+
+def _month_slices(ym: np.ndarray):
+    """(YYYYMM code, row indices) per month present in a batch, rows kept in file order."""
+    # One stable argsort groups rows by month while keeping their order within a month;
+    # np.unique on the sorted codes then gives each bucket's slice of row indices
+    order = np.argsort(ym, kind='stable')
+    codes, starts = np.unique(ym[order], return_index=True)
+    bounds = np.append(starts, len(order))
+    for i, code in enumerate(codes.tolist()):
+        if code != 0:
+            yield code, order[bounds[i]:bounds[i + 1]]
+
+
+def partition_parquet_file(src: Path, dry_run: bool = True, batch_size: int = 1 << 18):
+    """Partition a canonical 1m Parquet file into one Parquet file per month.
+
+    Each month file is written from scratch (one ParquetWriter per month, kept open for the
+    pass), so re-running the script replaces partitions instead of duplicating rows.
+    """
+    print(f"Processing: {src}")
+    base = src.name.split('_')[1]
+    dest_root = src.parent / '1m'
+    pf = pq.ParquetFile(src)
+    schema = pf.schema_arrow  # keeps the pandas metadata, so partitions load back indexed by datetime
+    ts_col = infer_timestamp_col(schema.names, [])
+    if ts_col is None:
+        print(f"Could not infer timestamp column for {src}; skipping")
+        return
+
+    written = 0
+    writers = {}
+    try:
+        for batch in pf.iter_batches(batch_size=batch_size):
+            col = batch.column(ts_col)
+            ts = col if pa.types.is_timestamp(col.type) else to_timestamps(pc.cast(col, pa.string()))
+            for code, rows in _month_slices(month_codes(ts)):
+                year, month = divmod(code, 100)
+                dest_file = dest_root / f"{year:04d}" / f"{month:02d}" / src.name
+                g = batch.take(rows)
+                if dry_run:
+                    print(f"DRY RUN: would write {g.num_rows} rows to {dest_file}")
+                    continue
+                writer = writers.get(code)
+                if writer is None:
+                    dest_file.parent.mkdir(parents=True, exist_ok=True)
+                    writer = writers[code] = pq.ParquetWriter(dest_file, schema, compression='zstd')
+                writer.write_batch(g)
+                written += g.num_rows
+    finally:
+        for writer in writers.values():
+            writer.close()
+    if not dry_run:
+        print(f"Wrote {written} rows for {base}")
 
 
-def partition_file(src: Path, dry_run: bool = True, chunksize: int = 100_000):
+# characters that force a CSV field to be quoted (csv.QUOTE_MINIMAL, as pandas' to_csv does)
+_NEEDS_QUOTING = r'[,"\r\n]'
+
+
+def _needs_quoting(batch: pa.RecordBatch) -> bool:
+    return any(pc.any(pc.match_substring_regex(col, _NEEDS_QUOTING)).as_py() for col in batch.columns)
+
+
+def _write_quoted(g: pa.RecordBatch, out) -> None:
+    """Write rows with minimal quoting: only fields containing a separator, quote or newline are
+    quoted (Arrow's 'needed' style would quote every string field)."""
+    buf = io.StringIO()
+    # None (empty field) is written as an empty string, matching the unquoted fast path
+    csv.writer(buf, lineterminator='\n').writerows(zip(*(col.to_pylist() for col in g.columns)))
+    out.write(buf.getvalue().encode('utf8'))
+
+
+def partition_file(src: Path, dry_run: bool = True, block_size: int = 16 << 20):
     print(f"Processing: {src}")
     basename = src.name
     parts = basename.split('_')
@@ -64,38 +150,69 @@ def partition_file(src: Path, dry_run: bool = True, chunksize: int = 100_000):
     base = parts[1]
     dest_root = src.parent / '1m'
 
-    reader = pd.read_csv(src, chunksize=chunksize)
+    with open(src, 'rb') as fh:
+        header_line = fh.readline()
+        first_line = fh.readline()
+    names = next(csv.reader([header_line.decode('utf8')]))
+    ts_col = infer_timestamp_col(names, next(csv.reader([first_line.decode('utf8')]), []))
+    if ts_col is None:
+        print(f"Could not infer timestamp column for {src}; skipping")
+        return
+    if not header_line.endswith(b'\n'):
+        header_line += b'\n'
+
+    # Arrow streams the file in large record batches. Every column is kept as text, so
+    # rows are written back byte-for-byte; only the timestamp column is parsed for bucketing.
+    # Empty fields come back as null (written back empty) so a blank timestamp doesn't fail the parse.
+    reader = pacsv.open_csv(
+        src,
+        read_options=pacsv.ReadOptions(block_size=block_size),
+        convert_options=pacsv.ConvertOptions(column_types={c: pa.string() for c in names}, strings_can_be_null=True),
+    )
+    write_opts = pacsv.WriteOptions(include_header=False, quoting_style='none')
     written = 0
-    for chunk in reader:
-        ts_col = infer_timestamp_col(chunk)
-        if ts_col is None:
-            print(f"Could not infer timestamp column for {src}; skipping chunk")
-            continue
-        chunk['_dt'] = to_datetime_series(chunk[ts_col])
-        chunk['_year'] = chunk['_dt'].dt.year.astype(int)
-        chunk['_month'] = chunk['_dt'].dt.month.astype(int)
-        # iterate groups
-        for (y, m), g in chunk.groupby(['_year', '_month']):
-            year = int(y)
-            month = int(m)
-            dest_dir = dest_root / f"{year:04d}" / f"{month:02d}"
-            dest_dir_parent = dest_dir
-            dest_dir_parent.mkdir(parents=True, exist_ok=True)
-            dest_file = dest_dir_parent / basename
-            if dry_run:
-                print(f"DRY RUN: would write {len(g)} rows to {dest_file}")
-            else:
-                # drop helper cols and append
-                out = g.drop(columns=['_dt','_year','_month'])
-                header = not dest_file.exists()
-                out.to_csv(dest_file, mode='a', index=False, header=header)
-                written += len(out)
+    # Destination files stay open for the whole pass, so each month is opened (and its
+    # header checked) once rather than once per batch. A source file spans at most a few
+    # hundred months, well under the fd limit.
+    dest_files = {}
+    open_files = {}
+    try:
+        for batch in reader:
+            ym = month_codes(to_timestamps(batch.column(ts_col)))
+            # Unquoted Arrow output is byte-identical for plain fields; the rare batch with a
+            # comma/quote/newline in some field goes through the csv module instead of failing
+            quote = not dry_run and _needs_quoting(batch)
+            for code, rows in _month_slices(ym):
+                g = batch.take(rows)
+                dest_file = dest_files.get(code)
+                if dest_file is None:
+                    year, month = divmod(code, 100)
+                    dest_dir = dest_root / f"{year:04d}" / f"{month:02d}"
+                    dest_dir.mkdir(parents=True, exist_ok=True)
+                    dest_file = dest_files[code] = dest_dir / basename
+                if dry_run:
+                    print(f"DRY RUN: would write {g.num_rows} rows to {dest_file}")
+                    continue
+                out = open_files.get(code)
+                if out is None:
+                    header = not dest_file.exists()
+                    out = open_files[code] = open(dest_file, 'ab')
+                    if header:
+                        out.write(header_line)
+                if quote:
+                    _write_quoted(g, out)
+                else:
+                    pacsv.write_csv(g, out, write_options=write_opts)
+                written += g.num_rows
+    finally:
+        for out in open_files.values():
+            out.close()
     if not dry_run:
         print(f"Wrote {written} rows for {base}")
 
 
 def main(argv=None):
-    p = argparse.ArgumentParser(description='Partition existing 1m CSVs into year/month folders')
+    p = argparse.ArgumentParser(description='Partition existing 1m Parquet/CSV files into year/month folders')
     p.add_argument('--data-root', default=str(DATA_ROOT), help='Root data folder for USDT')
     p.add_argument('--dry-run', action='store_true', help='Only print planned writes')
     p.add_argument('--symbol', help='Limit to single symbol (e.g. BTC)')
@@ -112,17 +229,22 @@ def main(argv=None):
             continue
         if args.symbol and sub.name.upper() != args.symbol.upper():
             continue
-        # look for canonical 1m csv
-        src = sub / f"crypto_{sub.name}_USDT_1m.csv"
+        # canonical 1m file: the fetcher's Parquet, else a legacy CSV
+        src = sub / f"crypto_{sub.name}_USDT_1m.parquet"
+        if not src.exists():
+            src = src.with_suffix('.csv')
         if src.exists():
             targets.append(src)
 
     if not targets:
-        print("No canonical 1m CSVs found to partition.")
+        print("No canonical 1m Parquet/CSV files found to partition.")
         return 0
 
     for t in targets:
-        partition_file(t, dry_run=args.dry_run)
+        if t.suffix == '.parquet':
+            partition_parquet_file(t, dry_run=args.dry_run)
+        else:
+            partition_file(t, dry_run=args.dry_run)
 
     return 0
 
@@ -2,14 +2,17 @@
 """Run the repository's pytest suite.
 
 By default this script excludes tests marked with 'integration' to avoid network calls.
-Pass any extra pytest args after `--`.
+Pass any extra pytest args after `--`. Tests run in-process via `pytest.main`;
+pass `--subprocess` to run them in a fresh interpreter instead.
 
 Examples:
   python scripts/run_all_tests.py            # run tests, excluding integration
   python scripts/run_all_tests.py -- -k smoke
   python scripts/run_all_tests.py -- -m "integration"  # run only integration tests
+  python scripts/run_all_tests.py --subprocess -- -k smoke
 """
 from __future__ import annotations
+import os
 import subprocess
 import sys
 from pathlib import Path
@@ -18,22 +21,34 @@ REPO_ROOT = Path(__file__).resolve().parents[1]
 
 
 def main(argv: list[str] | None = None) -> int:
-    argv = argv or sys.argv[1:]
+    argv = argv if argv is not None else sys.argv[1:]
 
     # Split user args at '--' so we can pass extras to pytest
     if '--' in argv:
         split_at = argv.index('--')
-        extra = argv[split_at + 1 :]
+        own, extra = argv[:split_at], argv[split_at + 1 :]
     else:
-        extra = []
+        own, extra = argv, []
 
     # Default pytest invocation: run unit tests from repo root (no integration tests present)
-    cmd = [sys.executable, '-m', 'pytest', '-q'] + extra
-
-    print(f"Running tests from {REPO_ROOT} with: {' '.join(cmd)}")
-
-    proc = subprocess.run(cmd, cwd=str(REPO_ROOT))
-    return proc.returncode
+    if '--subprocess' in own:
+        # isolated interpreter, e.g. when tests must not share state with the caller
+        cmd = [sys.executable, '-m', 'pytest', '-q'] + extra
+        print(f"Running tests from {REPO_ROOT} with: {' '.join(cmd)}")
+        proc = subprocess.run(cmd, cwd=str(REPO_ROOT))
+        return proc.returncode
+
+    # In-process by default: no second interpreter start-up or plugin discovery
+    import pytest
+
+    args = ['-q'] + extra
+    print(f"Running tests from {REPO_ROOT} with: pytest {' '.join(args)}")
+    prev_cwd = os.getcwd()
+    os.chdir(REPO_ROOT)
+    try:
+        return int(pytest.main(args))
+    finally:
+        os.chdir(prev_cwd)
 
 
 if __name__ == '__main__':
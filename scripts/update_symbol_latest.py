@@ -1,5 +1,5 @@
 #!/usr/bin/env python3
-"""Update the canonical CSV for one or more symbols to the most recent safe date.
+"""Update the canonical data file for one or more symbols to the most recent safe date.
 
 Usage examples:
   python scripts/update_symbol_latest.py BTC --timeframe 1d
@@ -26,7 +26,7 @@ def normalize_symbol(s: str) -> str:
 
 
 def main(argv=None):
-    p = argparse.ArgumentParser(description="Update canonical CSV(s) for given symbol(s) to most recent date")
+    p = argparse.ArgumentParser(description="Update canonical data file(s) for given symbol(s) to most recent date")
     p.add_argument('symbols', nargs='*', help='Symbol(s) to update, e.g. BTC or BTC/USDT (if omitted, defaults to top major pairs)')
     p.add_argument('--timeframe', '-t', default='1d', help='OHLC timeframe (e.g. 1h, 1d)')
     p.add_argument('--overlap', '-o', type=int, default=1, help='Number of overlapping bars to re-fetch to be safe')
@@ -34,20 +34,16 @@ def main(argv=None):
     p.add_argument('--exchange', default='binance', help='Exchange name for CCXT (default: binance)')
     args = p.parse_args(argv)
 
+    # One fetcher (one exchange client) serves both symbol discovery and the update.
     # If no symbols passed, use the fetcher's major pairs (top 5 by default)
-    if len(args.symbols) == 0:
-        temp_fetcher = CryptoDataFetcher(exchange_name=args.exchange)
-        symbols = temp_fetcher.get_major_pairs()[:5]
-    else:
-        symbols = [normalize_symbol(s) for s in args.symbols]
-
     fetcher = CryptoDataFetcher(exchange_name=args.exchange)
+    symbols = [normalize_symbol(s) for s in args.symbols] or fetcher.get_major_pairs()[:5]
 
     print(f"Updating symbols: {symbols} timeframe={args.timeframe} overlap={args.overlap} include_today={args.include_today}")
 
     # Use the fetcher's incremental updater if available
     if hasattr(fetcher, 'update_symbols_to_now'):
-        # days_back is None to rely on manifests/csv to determine where to resume
+        # days_back is None to rely on manifests/data files to determine where to resume
         results = fetcher.update_symbols_to_now(symbols=symbols, timeframe=args.timeframe, days_back=None, overlap=args.overlap, include_now=args.include_today)
         for sym, info in (results or {}).items():
             print(f"{sym}: {info}")
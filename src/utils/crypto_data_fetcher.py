@@ -7,8 +7,15 @@ Focus on safety, rate limiting, and data consistency
 import ccxt
 import pandas as pd
 import numpy as np
+import pyarrow as pa
+import pyarrow.csv as pacsv
 import time
 import os
+import threading
+from bisect import bisect_left, bisect_right
+from operator import itemgetter
+from concurrent.futures import ThreadPoolExecutor
+import io
 import json
 import hashlib
 from datetime import datetime, timedelta
@@ -19,25 +26,48 @@ from tqdm import tqdm
 import math
 
 ##command
+_ROW_TS = itemgetter(0)  # open time (ms) of a raw ccxt OHLCV row
+
+FIELD_DESCRIPTIONS = {
+    'open': 'Open price for the interval',
+    'high': 'Highest trade price during the interval',
+    'low': 'Lowest trade price during the interval',
+    'close': 'Close price for the interval',
+    'volume': 'Traded volume during the interval'
+}
+
 
 class CryptoDataFetcher:
     """
     Safe crypto data fetcher with rate limiting and error handling
     Supports multiple exchanges with focus on Binance as primary
     """
+
+    # Exchange metadata changes rarely; reuse load_markets() results for an hour, across
+    # instances in this process and across runs via a JSON file under MARKETS_CACHE_DIR
+    MARKETS_TTL = 3600
+    MARKETS_CACHE_DIR = Path("data") / ".cache"
+    _markets_cache: Dict[str, Tuple[float, dict]] = {}
+
+    # Candle lengths of the timeframes this project uses; others go through ccxt's parser
+    _TF_MS = {'1m': 60_000, '5m': 300_000, '15m': 900_000, '1h': 3_600_000, '4h': 14_400_000, '1d': 86_400_000}
     
-    def __init__(self, exchange_name: str = 'binance', rate_limit: float = 0.1):
+    def __init__(self, exchange_name: str = 'binance', rate_limit: float = 0.1, max_workers: int = 4):
         """
         Initialize fetcher
         
         Args:
             exchange_name: Exchange to use ('binance', 'kraken', 'coinbase', etc.)
             rate_limit: Minimum seconds between requests
+            max_workers: Symbols fetched/saved concurrently (requests still respect rate_limit)
         """
         self.exchange_name = exchange_name
         self.rate_limit = rate_limit
+        self.max_workers = max_workers
         self.exchange = None
+        self._major_pairs = None
         self.last_request_time = 0
+        self._rate_lock = threading.Lock()  # fetch_ohlcv_safe may be called from worker threads
         
         # Initialize exchange
         self._init_exchange()
@@ -69,7 +99,7 @@ class CryptoDataFetcher:
                 raise ValueError(f"Exchange {self.exchange_name} not supported")
                 
             # Test connection
-            self.exchange.load_markets()
+            self._load_markets()
             print(f"Connected to {self.exchange_name}")
             print(f"Found {len(self.exchange.markets)} trading pairs")
             
@@ -77,16 +107,50 @@ class CryptoDataFetcher:
             print(f"Failed to initialize {self.exchange_name}: {e}")
             raise
     
+    def _load_markets(self):
+        """load_markets(), served from the in-process or on-disk cache while it is younger than MARKETS_TTL"""
+        key = self.exchange_name.lower()
+        now = time.time()
+        cached = self._markets_cache.get(key)
+        if cached and now - cached[0] < self.MARKETS_TTL:
+            self.exchange.set_markets(cached[1])
+            return
+
+        cache_file = self.MARKETS_CACHE_DIR / f"markets_{key}.json"
+        try:
+            mtime = cache_file.stat().st_mtime
+            if now - mtime < self.MARKETS_TTL:
+                with open(cache_file, 'r', encoding='utf-8') as f:
+                    markets = json.load(f)
+                self.exchange.set_markets(markets)
+                self._markets_cache[key] = (mtime, markets)
+                return
+        except (OSError, ValueError):
+            pass  # missing or unreadable cache -> fetch
+
+        markets = self.exchange.load_markets()
+        self._markets_cache[key] = (now, markets)
+        try:
+            self.MARKETS_CACHE_DIR.mkdir(parents=True, exist_ok=True)
+            with open(cache_file, 'w', encoding='utf-8') as f:
+                json.dump(markets, f)
+        except (OSError, TypeError, ValueError) as e:
+            print(f"Could not cache markets for {self.exchange_name}: {e}")
+
     def _respect_rate_limit(self):
-        """Ensure we don't exceed rate limits"""
-        elapsed = time.time() - self.last_request_time
-        if elapsed < self.rate_limit:
-            sleep_time = self.rate_limit - elapsed
-            time.sleep(sleep_time)
-        self.last_request_time = time.time()
+        """Ensure we don't exceed rate limits (safe to call from multiple threads)"""
+        with self._rate_lock:
+            elapsed = time.time() - self.last_request_time
+            if elapsed < self.rate_limit:
+                sleep_time = self.rate_limit - elapsed
+                time.sleep(sleep_time)
+            self.last_request_time = time.time()
     
     def get_major_pairs(self) -> List[str]:
-        """Get list of major cryptocurrency pairs"""
+        """Get list of major cryptocurrency pairs (computed once per instance)"""
+        if self._major_pairs is not None:
+            return list(self._major_pairs)
+
         major_cryptos = ['BTC', 'ETH', 'BNB', 'XRP', 'ADA', 'SOL', 'DOT', 'AVAX', 'MATIC', 'LINK']
         quote_currencies = ['USDT', 'USDC', 'USD']
         
@@ -100,7 +164,8 @@ class CryptoDataFetcher:
                     break  # Take first available quote currency
 
         print(f"Found {len(available_pairs)} major pairs: {available_pairs}")
-        return available_pairs
+        self._major_pairs = available_pairs
+        return list(available_pairs)
     
     def fetch_ohlcv_safe(self, symbol: str, timeframe: str = '1h', 
                         since: Optional[int] = None, limit: int = 1000) -> pd.DataFrame:
@@ -122,21 +187,140 @@ class CryptoDataFetcher:
                 print(f"No data returned for {symbol}")
                 return pd.DataFrame()
             
-            # Convert to DataFrame
-            df = pd.DataFrame(ohlcv, columns=['timestamp', 'open', 'high', 'low', 'close', 'volume'])
-            df['datetime'] = pd.to_datetime(df['timestamp'], unit='ms')
-            df.set_index('datetime', inplace=True)
-            df.drop('timestamp', axis=1, inplace=True)
-            
-            # Add symbol for tracking
-            df['symbol'] = symbol
-            
-            return df
+            # Convert to DataFrame (typed columns from one ndarray, symbol kept in df.attrs)
+            return self._ohlcv_frame(ohlcv, symbol)
             
         except Exception as e:
             print(f"Error fetching {symbol}: {e}")
             return pd.DataFrame()
     
+    def _fetch_ohlcv_rows(self, symbol: str, timeframe: str = '1h',
+                          since: Optional[int] = None, limit: int = 1000) -> Optional[list]:
+        """Fetch one page of raw ccxt OHLCV rows ([timestamp_ms, o, h, l, c, v]).
+
+        Returns [] when the exchange has no candles for the page and None when the request failed,
+        so callers can tell the end of history apart from a page that still has to be fetched.
+        """
+        self._respect_rate_limit()
+
+        try:
+            ohlcv = self.exchange.fetch_ohlcv(symbol, timeframe, since, limit)
+        except Exception as e:
+            print(f"Error fetching {symbol}: {e}")
+            return None
+
+        if not ohlcv:
+            print(f"No data returned for {symbol}")
+            return []
+        return ohlcv
+
+    @staticmethod
+    def _ohlcv_frame(rows: list, symbol: str) -> pd.DataFrame:
+        """Build one DataFrame from raw OHLCV rows accumulated over all pages of a symbol"""
+        arr = np.asarray(rows, dtype=np.float64)
+        df = pd.DataFrame(
+            {'open': arr[:, 1], 'high': arr[:, 2], 'low': arr[:, 3], 'close': arr[:, 4], 'volume': arr[:, 5]},
+            index=pd.DatetimeIndex(pd.to_datetime(arr[:, 0].astype('int64'), unit='ms'), name='datetime'),
+        )
+        # Symbol travels as metadata (callers key frames by symbol anyway) rather than as an
+        # object column of identical strings
+        df.attrs['symbol'] = symbol
+        return df
+
+    @staticmethod
+    def _dedup_sorted(df: pd.DataFrame) -> pd.DataFrame:
+        """Drop duplicate timestamps (keeping the last) and sort the index.
+
+        Pages arrive in order, so the index is usually already ascending: then duplicates can
+        only be adjacent, the sort is skipped, and a unique index is returned as-is.
+        """
+        if df.index.is_monotonic_increasing:
+            return df if df.index.is_unique else df[~df.index.duplicated(keep='last')]
+        return df[~df.index.duplicated(keep='last')].sort_index()
+
+    @classmethod
+    def _timeframe_ms(cls, timeframe: str) -> Optional[int]:
+        """Candle length in ms ('1h' -> 3_600_000), or None if ccxt can't parse the timeframe"""
+        if timeframe in cls._TF_MS:
+            return cls._TF_MS[timeframe]
+        try:
+            return int(ccxt.Exchange.parse_timeframe(timeframe) * 1000)
+        except Exception:
+            return None
+
+    def _fetch_symbol_rows(self, symbol: str, timeframe: str, since_ms: int, end_time_ms: int,
+                           verbose: bool = False) -> list:
+        """Page through [since_ms, end_time_ms] for one symbol and return all raw OHLCV rows"""
+        if verbose:
+            print(f"\nFetching {symbol}...")
+
+        # Raw rows from every page; callers build a single DataFrame once the symbol is done
+        all_rows = []
+
+        # For a fixed [since, end] range the page boundaries are known up front
+        # (since + k * 1000 candles), so all pages are requested at once and reassembled in
+        # order. Each page is clipped to its own window, which keeps pages disjoint even when
+        # the exchange has gaps and returns candles from beyond the window.
+        interval_ms = self._timeframe_ms(timeframe)
+        if interval_ms and end_time_ms - since_ms >= 1000 * interval_ms:
+            span = 1000 * interval_ms
+            starts = list(range(since_ms, end_time_ms + 1, span))
+            with ThreadPoolExecutor(max_workers=max(1, min(self.max_workers, len(starts)))) as ex:
+                pages = list(ex.map(lambda start: self._fetch_ohlcv_rows(symbol, timeframe, start, 1000), starts))
+            for start, page in zip(starts, pages):
+                if page is None:
+                    # A failed page must not be skipped: the saved history would keep a hole that
+                    # incremental updates (which resume after the last candle) never revisit.
+                    # Continue serially from this window instead; that retries it and, like the
+                    # serial loop always did, stops at the first persistent error.
+                    all_rows.extend(self._fetch_rows_sequential(symbol, timeframe, start, end_time_ms, verbose))
+                    return all_rows
+                stop = min(start + span - 1, end_time_ms)
+                # Pages come back in ascending timestamp order, so the window is a slice
+                lo = bisect_left(page, start, key=_ROW_TS)
+                all_rows.extend(page[lo:bisect_right(page, stop, lo=lo, key=_ROW_TS)])
+                if verbose and page:
+                    print(f"  Fetched {len(page)} candles ending {pd.to_datetime(int(page[-1][0]), unit='ms')}")
+            return all_rows
+
+        return self._fetch_rows_sequential(symbol, timeframe, since_ms, end_time_ms, verbose)
+
+    def _fetch_rows_sequential(self, symbol: str, timeframe: str, since_ms: int, end_time_ms: int,
+                               verbose: bool = False) -> list:
+        """Page through [since_ms, end_time_ms] one request at a time, stopping at the first
+        empty or failed page (the returned rows are always a contiguous prefix of the range)"""
+        all_rows = []
+        current_since = since_ms
+
+        # Fetch data in chunks (most exchanges limit to 1000 candles per request)
+        while True:
+            page = self._fetch_ohlcv_rows(symbol, timeframe, current_since, 1000)
+
+            if not page:
+                break
+
+            # If the newest candle we received is beyond our requested end_time_ms,
+            # trim and stop fetching further.
+            last_ts = int(page[-1][0])
+            if last_ts >= end_time_ms:
+                # Trim any rows beyond end_time_ms (the page is sorted, so that's a suffix)
+                all_rows.extend(page[:bisect_right(page, end_time_ms, key=_ROW_TS)])
+                break
+
+            all_rows.extend(page)
+
+            # If the exchange returned fewer than limit candles, we've reached the available history
+            if len(page) < 1000:
+                break
+
+            # Update since timestamp for next chunk
+            current_since = last_ts + 1
+
+            if verbose:
+                print(f"  Fetched {len(page)} candles ending {pd.to_datetime(last_ts, unit='ms')}")
+
+        return all_rows
+
     def fetch_historical_data(self, symbols: List[str], timeframe: str = '1h', 
                             days_back: int = 365, end_time_ms: Optional[int] = None) -> Dict[str, pd.DataFrame]:
         """
@@ -160,45 +344,19 @@ class CryptoDataFetcher:
             end_time_ms = int((start_of_today - timedelta(milliseconds=1)).timestamp() * 1000)
         
         data_dict = {}
-        
-        for symbol in tqdm(symbols, desc="Fetching data"):
-            print(f"\nFetching {symbol}...")
-            
-            all_data = []
-            current_since = start_time
-            
-            # Fetch data in chunks (most exchanges limit to 1000 candles per request)
-            while True:
-                df = self.fetch_ohlcv_safe(symbol, timeframe, current_since, 1000)
-
-                if df.empty:
-                    break
-
-                all_data.append(df)
-
-                # If the newest candle we received is beyond our requested end_time_ms,
-                # trim and stop fetching further.
-                last_ts = int(df.index[-1].timestamp() * 1000)
-                if last_ts >= end_time_ms:
-                    # Trim any rows beyond end_time_ms
-                    df = df[df.index <= pd.to_datetime(end_time_ms, unit='ms')]
-                    all_data[-1] = df
-                    break
 
-                # If the exchange returned fewer than limit candles, we've reached the available history
-                if len(df) < 1000:
-                    break
+        # Symbols are fetched concurrently: their requests overlap on the network while
+        # _respect_rate_limit still spaces request starts across all threads
+        with ThreadPoolExecutor(max_workers=max(1, min(self.max_workers, len(symbols)))) as ex:
+            futures = [ex.submit(self._fetch_symbol_rows, symbol, timeframe, start_time, end_time_ms, True)
+                       for symbol in symbols]
+            rows_by_symbol = [f.result() for f in tqdm(futures, desc="Fetching data")]
 
-                # Update since timestamp for next chunk
-                current_since = int(df.index[-1].timestamp() * 1000) + 1
-
-                print(f"  Fetched {len(df)} candles ending {df.index[-1]}")
-            
-            if all_data:
+        for symbol, all_rows in zip(symbols, rows_by_symbol):
+            if all_rows:
                 # Combine all chunks
-                combined_df = pd.concat(all_data)
-                combined_df = combined_df[~combined_df.index.duplicated(keep='last')]  # Remove duplicates
-                combined_df.sort_index(inplace=True)
+                combined_df = self._ohlcv_frame(all_rows, symbol)
+                combined_df = self._dedup_sorted(combined_df)  # Remove duplicates
                 
                 data_dict[symbol] = combined_df
                 print(f"  Total: {len(combined_df)} candles from {combined_df.index[0]} to {combined_df.index[-1]}")
@@ -230,196 +388,387 @@ class CryptoDataFetcher:
         except Exception:
             return None
 
+    @staticmethod
+    def _read_ohlcv_file(filepath: Path) -> Optional[pd.DataFrame]:
+        """Load a canonical per-symbol file (Parquet), falling back to a legacy CSV of the same name.
+
+        Returns None when neither exists. Legacy CSVs are migrated the next time the symbol is written.
+        Older files carry a `symbol` column; it is dropped so history concatenates cleanly with new rows.
+        """
+        if filepath.exists():
+            return pd.read_parquet(filepath, engine='pyarrow').drop(columns='symbol', errors='ignore')
+        legacy = filepath.with_suffix('.csv')
+        if legacy.exists():
+            # Arrow's multi-threaded reader parses floats and timestamps in C++; anything it
+            # can't type (e.g. timestamps with offsets) goes through pandas as before
+            try:
+                table = pacsv.read_csv(legacy, convert_options=pacsv.ConvertOptions(
+                    column_types={'datetime': pa.timestamp('ns')}))
+                df = table.to_pandas().set_index('datetime')
+            except (pa.ArrowInvalid, KeyError):
+                df = pd.read_csv(legacy, index_col='datetime', parse_dates=True)
+            return df.drop(columns='symbol', errors='ignore')
+        return None
+
+    @staticmethod
+    def _write_ohlcv_file(df: pd.DataFrame, filepath: Path) -> str:
+        """Write a canonical per-symbol file and return its hash (see _file_hash).
+
+        Parquet keeps float64/timestamps binary, so reloads skip text parsing. The file is
+        serialized in memory and written with a single write, and the digest is taken from
+        those bytes instead of reading the file back.
+        """
+        buf = io.BytesIO()
+        df.to_parquet(buf, engine='pyarrow', compression='zstd')
+        data = buf.getbuffer()
+        with open(filepath, 'wb') as f:
+            f.write(data)
+        return hashlib.blake2b(data, digest_size=16).hexdigest()
+
+    @staticmethod
+    def _file_hash(filepath: Path, chunk_size: int = 1 << 20) -> str:
+        """BLAKE2b-128 hex digest of a file, streamed in 1 MiB chunks (same length as the MD5 it replaces)."""
+        h = hashlib.blake2b(digest_size=16)
+        with open(filepath, 'rb') as f:
+            for chunk in iter(lambda: f.read(chunk_size), b''):
+                h.update(chunk)
+        return h.hexdigest()
+
+    def _read_manifest_fields(self, symbol_dir: Path, timeframe: str) -> Tuple[Optional[int], Dict[str, dict]]:
+        """Read `rows` and the per-field stats (numbers only) back from a per-symbol YAML manifest."""
+        manifest_path = symbol_dir / f"manifest_{timeframe}.yaml"
+        rows, fields = None, {}
+        if not manifest_path.exists():
+            return rows, fields
+        try:
+            with open(manifest_path, 'r', encoding='utf-8') as f:
+                section, col = None, None
+                for line in f:
+                    if not line.startswith(' '):
+                        section = line.split(':', 1)[0]
+                        if section == 'rows':
+                            rows = int(line.split(':', 1)[1])
+                    elif section == 'fields' and not line.startswith('    '):
+                        col = line.strip().rstrip(':')
+                        fields[col] = {}
+                    elif section == 'fields' and col is not None:
+                        key, value = line.strip().split(':', 1)
+                        try:
+                            fields[col][key] = float(value)
+                        except ValueError:
+                            pass  # name/description, or None
+        except Exception:
+            return None, {}
+        return rows, fields
+
+    def _field_stats(self, final_df: pd.DataFrame, symbol_dir: Path, timeframe: str,
+                     new_rows: Optional[pd.DataFrame] = None) -> Dict[str, dict]:
+        """Per-field manifest stats for final_df.
+
+        When `new_rows` are the only rows appended since the manifest was last written, min/max,
+        nulls and the running count/mean/M2 (sum of squared deviations from the mean) are merged
+        from the manifest and `new_rows` alone with Chan et al.'s parallel update, which stays
+        accurate at crypto price levels where sum/sum-of-squares cancels; std follows from M2.
+        The median still needs the full column. Anything else (no manifest, one written without
+        M2, a row count that doesn't add up) recomputes from final_df.
+        """
+        prior = {}
+        if new_rows is not None:
+            prior_rows, prior = self._read_manifest_fields(symbol_dir, timeframe)
+            if prior_rows is None or prior_rows + len(new_rows) != len(final_df):
+                prior = {}
+
+        cols = [c for c in FIELD_DESCRIPTIONS if c in final_df.columns]
+        incremental = [c for c in cols if all(k in prior.get(c, {}) for k in ('count', 'mean', 'm2', 'nulls'))]
+        full = [c for c in cols if c not in incremental]
+
+        # One agg call over all columns that need a full pass, rather than a reduction per stat per column
+        if full:
+            block = final_df[full]
+            stats = block.agg(['min', 'max', 'mean', 'median', 'std', 'count'])
+            m2 = ((block - stats.loc['mean']) ** 2).sum()
+        if incremental:
+            medians = final_df[incremental].median()
+
+        fields = {}
+        for col in cols:
+            if col in incremental:
+                old = prior[col]
+                v = new_rows[col].to_numpy(dtype='float64')
+                nulls = int(old['nulls']) + int(np.isnan(v).sum())
+                v = v[~np.isnan(v)]
+                n_a, n_b = int(old['count']), len(v)
+                count = n_a + n_b
+                mean, col_m2 = old['mean'], old['m2']
+                if n_b:
+                    mean_b = float(v.mean())
+                    m2_b = float(((v - mean_b) ** 2).sum())
+                    delta = mean_b - mean
+                    mean = mean + delta * n_b / count
+                    col_m2 = col_m2 + m2_b + delta * delta * n_a * n_b / count
+                lo = [x for x in (old.get('min'), float(v.min()) if n_b else None) if x is not None]
+                hi = [x for x in (old.get('max'), float(v.max()) if n_b else None) if x is not None]
+                std = None
+                if count > 1:
+                    std = math.sqrt(max(col_m2, 0.0) / (count - 1))
+                elif count == 1:
+                    std = float('nan')  # matches pandas' sample std of a single value
+                meta = {
+                    'min': min(lo) if lo else None,
+                    'max': max(hi) if hi else None,
+                    'mean': mean,
+                    'median': float(medians[col]) if count else None,
+                    'std': std,
+                    'nulls': nulls,
+                    'count': count,
+                    'm2': col_m2,
+                }
+            else:
+                st = stats[col]
+                count = int(st['count'])
+                meta = {
+                    'min': float(st['min']) if count else None,
+                    'max': float(st['max']) if count else None,
+                    'mean': float(st['mean']) if count else None,
+                    'median': float(st['median']) if count else None,
+                    'std': float(st['std']) if count else None,
+                    'nulls': len(final_df) - count,
+                    'count': count,
+                    'm2': float(m2[col]),
+                }
+            fields[col] = {'name': col, 'description': FIELD_DESCRIPTIONS.get(col, ''), **meta}
+        return fields
+
+    def _write_manifest(self, symbol: str, symbol_dir: Path, timeframe: str, final_df: pd.DataFrame,
+                        new_rows: Optional[pd.DataFrame] = None) -> Path:
+        """Write the per-symbol `manifest_<timeframe>.yaml` for final_df and return its path.
+
+        The YAML is built by hand (one joined write) to avoid adding a dependency; see
+        _field_stats for how `new_rows` lets an append reuse the previous manifest's running stats.
+        """
+        # Build fields stats (same field descriptions as validator)
+        fields = self._field_stats(final_df, symbol_dir, timeframe, new_rows)
+
+        total_return_pct = None
+        try:
+            if 'close' in final_df.columns and len(final_df['close']) >= 2:
+                total_return_pct = float((final_df['close'].iloc[-1] / final_df['close'].iloc[0] - 1) * 100)
+        except Exception:
+            total_return_pct = None
+
+        insights = {
+            'price_range': {
+                'min_close': fields.get('close', {}).get('min'),
+                'max_close': fields.get('close', {}).get('max')
+            },
+            'avg_volume': fields.get('volume', {}).get('mean') if fields.get('volume') else None
+        }
+
+        lines = [
+            f"symbol: {symbol}\n",
+            f"timeframe: {timeframe}\n",
+            f"rows: {int(len(final_df))}\n",
+            f"start_date: '{final_df.index[0]}'\n",
+            f"end_date: '{final_df.index[-1]}'\n",
+            f"total_return_pct: {total_return_pct}\n",
+            "fields:\n",
+        ]
+        for col, meta in fields.items():
+            lines += [
+                f"  {col}:\n",
+                f"    name: {meta['name']}\n",
+                f"    description: '{meta['description']}'\n",
+                f"    min: {meta['min']}\n",
+                f"    max: {meta['max']}\n",
+                f"    mean: {meta['mean']}\n",
+                f"    median: {meta['median']}\n",
+                f"    std: {meta['std']}\n",
+                f"    nulls: {meta['nulls']}\n",
+                f"    count: {meta['count']}\n",
+                f"    m2: {meta['m2']}\n",
+            ]
+        lines += [
+            "insights:\n",
+            "  price_range:\n",
+            f"    min_close: {insights['price_range']['min_close']}\n",
+            f"    max_close: {insights['price_range']['max_close']}\n",
+            f"  avg_volume: {insights['avg_volume']}\n",
+        ]
+
+        manifest_path = symbol_dir / f"manifest_{timeframe}.yaml"
+        with open(manifest_path, 'w', encoding='utf-8') as mf:
+            mf.write(''.join(lines))
+        return manifest_path
+
     def update_symbols_to_now(self, symbols: List[str], timeframe: str = '1h', days_back: int = 365, overlap: int = 1, include_now: bool = True) -> Dict[str, pd.DataFrame]:
-        """Update per-symbol CSVs by fetching missing data up to now.
+        """Update per-symbol data files by fetching missing data up to now.
 
         Algorithm:
-        - For each symbol, look for an existing canonical CSV under `data/crypto/USDT/<BASE>/`.
+        - For each symbol, look for an existing canonical file under `data/crypto/USDT/<BASE>/`
+          (Parquet, or a legacy CSV which gets migrated).
         - If found, use its last timestamp as the since point (minus an `overlap` number of intervals to be safe).
         - If no file exists, fetch `days_back` of history.
         - Fetch up to now if `include_now` is True, otherwise up to end-of-yesterday.
-        - Append new rows to the canonical CSV and update per-symbol YAML manifest.
+        - Append new rows to the canonical file and update per-symbol YAML manifest.
         """
         now_utc = datetime.utcnow()
-        interval = None
-        if timeframe.endswith('h'):
-            # e.g., '1h' -> 3600 seconds
-            n = int(timeframe.replace('h','')) if timeframe.replace('h','').isdigit() else 1
-            interval = timedelta(hours=n)
-        elif timeframe.endswith('d'):
-            n = int(timeframe.replace('d','')) if timeframe.replace('d','').isdigit() else 1
-            interval = timedelta(days=n)
+        # fallback: assume hours
+        interval_ms = self._timeframe_ms(timeframe) or self._TF_MS['1h']
+
+        # Determine end_time_ms
+        if include_now:
+            end_time_ms = int(now_utc.timestamp() * 1000)
         else:
-            # fallback: assume hours
-            interval = timedelta(hours=1)
+            start_of_today = datetime(now_utc.year, now_utc.month, now_utc.day)
+            end_time_ms = int((start_of_today - timedelta(milliseconds=1)).timestamp() * 1000)
 
         results = {}
 
+        plans = []
         for symbol in symbols:
             base = symbol.split('/')[0]
             symbol_dir = self.data_dir / base
             symbol_dir.mkdir(parents=True, exist_ok=True)
-            filename = f"crypto_{base}_USDT_{timeframe}.csv"
+            filename = f"crypto_{base}_USDT_{timeframe}.parquet"
             filepath = symbol_dir / filename
 
-            if filepath.exists():
-                existing = pd.read_csv(filepath, index_col='datetime', parse_dates=True)
-                last_ts = existing.index[-1]
-                since_dt = last_ts - overlap * interval
-                since_ms = int(since_dt.timestamp() * 1000)
+            existing = self._read_ohlcv_file(filepath)
+            if existing is not None:
+                last_ms = existing.index[-1].value // 1_000_000  # ns -> ms
+                # Without the open bar there is nothing to refresh: if the next candle opens
+                # after end_time_ms the stored history is already complete, so skip the request
+                if not include_now and last_ms + interval_ms > end_time_ms:
+                    print(f"\n{symbol} is up to date (last candle {existing.index[-1]})")
+                    results[symbol] = existing
+                    continue
+                since_ms = last_ms - overlap * interval_ms
             else:
                 # No existing file, start days_back
                 since_dt = now_utc - timedelta(days=days_back)
                 since_ms = int(since_dt.timestamp() * 1000)
 
-            # Determine end_time_ms
-            if include_now:
-                end_time_ms = int(now_utc.timestamp() * 1000)
-            else:
-                start_of_today = datetime(now_utc.year, now_utc.month, now_utc.day)
-                end_time_ms = int((start_of_today - timedelta(milliseconds=1)).timestamp() * 1000)
-
             # Fetch per-symbol with since and end_time_ms
             print(f"\nUpdating {symbol} from {pd.to_datetime(since_ms, unit='ms')} to {pd.to_datetime(end_time_ms, unit='ms')}")
-
-            all_chunks = []
-            current_since = since_ms
-            while True:
-                df = self.fetch_ohlcv_safe(symbol, timeframe, current_since, 1000)
-                if df.empty:
-                    break
-                all_chunks.append(df)
-
-                last_ts = int(df.index[-1].timestamp() * 1000)
-                if last_ts >= end_time_ms:
-                    # Trim
-                    df = df[df.index <= pd.to_datetime(end_time_ms, unit='ms')]
-                    all_chunks[-1] = df
-                    break
-
-                if len(df) < 1000:
-                    break
-
-                current_since = int(df.index[-1].timestamp() * 1000) + 1
-
-            if all_chunks:
-                combined_df = pd.concat(all_chunks)
-                combined_df = combined_df[~combined_df.index.duplicated(keep='last')]
-                combined_df.sort_index(inplace=True)
+            plans.append((symbol, symbol_dir, filepath, since_ms, end_time_ms, existing))
+
+        # Network fetches overlap across symbols (rate limiting is shared); merging and
+        # manifest writes below stay sequential
+        with ThreadPoolExecutor(max_workers=max(1, min(self.max_workers, len(plans)))) as ex:
+            futures = [ex.submit(self._fetch_symbol_rows, symbol, timeframe, since_ms, end_time_ms)
+                       for symbol, _, _, since_ms, end_time_ms, _ in plans]
+            fetched = [f.result() for f in futures]
+
+        for (symbol, symbol_dir, filepath, _, _, existing), all_rows in zip(plans, fetched):
+            new_rows = None  # None -> manifest stats are recomputed from final_df
+            changed = False
+            if all_rows:
+                combined_df = self._ohlcv_frame(all_rows, symbol)
+                combined_df = self._dedup_sorted(combined_df)
 
                 # Merge with existing if any
-                if filepath.exists():
-                    existing = pd.read_csv(filepath, index_col='datetime', parse_dates=True)
-                    merged = pd.concat([existing, combined_df])
-                    merged = merged[~merged.index.duplicated(keep='last')]
-                    merged.sort_index(inplace=True)
-                    merged.to_csv(filepath)
-                    final_df = merged
+                if existing is not None:
+                    # The refetched overlap normally matches what is on disk; then the rows past
+                    # the old end are simply appended. A changed candle (e.g. one that was still
+                    # open at the last update) falls back to merging the whole history.
+                    last_ts = existing.index[-1]
+                    overlap_df = combined_df[combined_df.index <= last_ts]
+                    cols = [c for c in FIELD_DESCRIPTIONS if c in existing.columns]
+                    pos = existing.index.searchsorted(combined_df.index[0])
+                    on_disk = existing.iloc[pos:].reindex(overlap_df.index)
+                    if np.allclose(overlap_df[cols].to_numpy(dtype='float64'), on_disk[cols].to_numpy(dtype='float64'),
+                                   rtol=1e-12, atol=0.0, equal_nan=True):
+                        new_rows = combined_df[combined_df.index > last_ts]
+                        final_df = pd.concat([existing, new_rows], copy=False, sort=False) if not new_rows.empty else existing
+                    else:
+                        final_df = self._dedup_sorted(pd.concat([existing, combined_df], copy=False, sort=False))
+                    changed = final_df is not existing
+                    if changed or not filepath.exists():
+                        self._write_ohlcv_file(final_df, filepath)
                 else:
-                    combined_df.to_csv(filepath)
+                    self._write_ohlcv_file(combined_df, filepath)
                     final_df = combined_df
+                    changed = True
 
                 print(f"  Updated {filepath} -> {len(final_df)} rows")
                 results[symbol] = final_df
             else:
                 print(f"  No new data for {symbol}")
-                if filepath.exists():
-                    results[symbol] = pd.read_csv(filepath, index_col='datetime', parse_dates=True)
+                if existing is not None:
+                    results[symbol] = existing
+                    new_rows = existing.iloc[:0]
 
-            # After update, write per-symbol YAML manifest for timeframe
-            # Reuse existing logic in save_data by building a small manifest dict
+            # After update, write per-symbol YAML manifest for timeframe (same writer as save_data);
+            # unchanged data keeps its existing manifest
+            if symbol not in results:
+                continue
+            if not changed and (symbol_dir / f"manifest_{timeframe}.yaml").exists():
+                continue
             try:
-                # read final_df if not set
-                if symbol in results:
-                    final_df = results[symbol]
-                else:
-                    if filepath.exists():
-                        final_df = pd.read_csv(filepath, index_col='datetime', parse_dates=True)
-                    else:
-                        continue
-
-                # Build minimal manifest-like dict and call manifest writer block
-                # Reuse same code as in save_data's manifest writer (fields, insights)
-                field_descriptions = {
-                    'open': 'Open price for the interval',
-                    'high': 'Highest trade price during the interval',
-                    'low': 'Lowest trade price during the interval',
-                    'close': 'Close price for the interval',
-                    'volume': 'Traded volume during the interval'
-                }
-
-                fields = {}
-                for col in ['open', 'high', 'low', 'close', 'volume']:
-                    if col not in final_df.columns:
-                        continue
-                    s = final_df[col].dropna()
-                    fields[col] = {
-                        'name': col,
-                        'description': field_descriptions.get(col, ''),
-                        'min': float(s.min()) if not s.empty else None,
-                        'max': float(s.max()) if not s.empty else None,
-                        'mean': float(s.mean()) if not s.empty else None,
-                        'median': float(s.median()) if not s.empty else None,
-                        'std': float(s.std()) if not s.empty else None,
-                        'nulls': int(final_df[col].isnull().sum())
-                    }
-
-                total_return_pct = None
-                try:
-                    if 'close' in final_df.columns and len(final_df['close']) >= 2:
-                        total_return_pct = float((final_df['close'].iloc[-1] / final_df['close'].iloc[0] - 1) * 100)
-                except Exception:
-                    total_return_pct = None
-
-                insights = {
-                    'price_range': {
-                        'min_close': fields.get('close', {}).get('min'),
-                        'max_close': fields.get('close', {}).get('max')
-                    },
-                    'avg_volume': fields.get('volume', {}).get('mean') if fields.get('volume') else None
-                }
-
-                symbol_meta = {
-                    'symbol': symbol,
-                    'timeframe': timeframe,
-                    'rows': int(len(final_df)),
-                    'start_date': str(final_df.index[0]),
-                    'end_date': str(final_df.index[-1]),
-                    'total_return_pct': total_return_pct
-                }
-
-                manifest_path = symbol_dir / f"manifest_{timeframe}.yaml"
-                with open(manifest_path, 'w', encoding='utf-8') as mf:
-                    mf.write(f"symbol: {symbol}\n")
-                    mf.write(f"timeframe: {timeframe}\n")
-                    mf.write(f"rows: {symbol_meta['rows']}\n")
-                    mf.write(f"start_date: '{symbol_meta['start_date']}'\n")
-                    mf.write(f"end_date: '{symbol_meta['end_date']}'\n")
-                    mf.write(f"total_return_pct: {symbol_meta['total_return_pct']}\n")
-                    mf.write("fields:\n")
-                    for col, meta in fields.items():
-                        mf.write(f"  {col}:\n")
-                        mf.write(f"    name: {meta['name']}\n")
-                        mf.write(f"    description: '{meta['description']}'\n")
-                        mf.write(f"    min: {meta['min']}\n")
-                        mf.write(f"    max: {meta['max']}\n")
-                        mf.write(f"    mean: {meta['mean']}\n")
-                        mf.write(f"    median: {meta['median']}\n")
-                        mf.write(f"    std: {meta['std']}\n")
-                        mf.write(f"    nulls: {meta['nulls']}\n")
-                    mf.write("insights:\n")
-                    mf.write("  price_range:\n")
-                    mf.write(f"    min_close: {insights['price_range']['min_close']}\n")
-                    mf.write(f"    max_close: {insights['price_range']['max_close']}\n")
-                    mf.write(f"  avg_volume: {insights['avg_volume']}\n")
-
+                self._write_manifest(symbol, symbol_dir, timeframe, results[symbol], new_rows)
             except Exception as e:
                 print(f"  Failed to write manifest for {symbol}: {e}")
 
         return results
     
+    def _save_one(self, symbol: str, df: pd.DataFrame, timeframe: str) -> dict:
+        """Write one symbol's data file and YAML manifest; returns its entry for save_data's manifest"""
+        safe_symbol = symbol.replace('/', '_')
+        filename = f"crypto_{safe_symbol}_{timeframe}.parquet"  # stable filename
+        base = symbol.split('/')[0]
+        symbol_dir = self.data_dir / base
+        symbol_dir.mkdir(parents=True, exist_ok=True)
+        filepath = symbol_dir / filename
+
+        # If a file already exists, read and append only missing rows
+        new_rows = None  # None -> manifest stats are recomputed from final_df
+        file_hash = None  # set when this call writes the file
+        existing = self._read_ohlcv_file(filepath)
+        if existing is not None:
+            # Only keep new rows beyond the last timestamp in existing file; they all sort
+            # after the history, so a plain concat keeps the index ordered
+            last_ts = existing.index[-1]
+            new_rows = df[df.index > last_ts]
+            if not new_rows.empty:
+                final_df = pd.concat([existing, new_rows], copy=False, sort=False)
+                file_hash = self._write_ohlcv_file(final_df, filepath)
+                action = f"appended {len(new_rows)} rows"
+            else:
+                final_df = existing
+                if not filepath.exists():
+                    file_hash = self._write_ohlcv_file(final_df, filepath)  # migrate the legacy CSV
+                action = "no new rows"
+        else:
+            # Write new file
+            file_hash = self._write_ohlcv_file(df, filepath)
+            final_df = df
+            action = f"wrote {len(df)} rows"
+
+        # Calculate file hash for integrity (only needs a read when nothing was written)
+        if file_hash is None:
+            file_hash = self._file_hash(filepath)
+
+        entry = {
+            'filename': filename,
+            'rows': len(final_df),
+            'start_date': final_df.index[0].isoformat(),
+            'end_date': final_df.index[-1].isoformat(),
+            'hash': file_hash,
+            'subfolder': base
+        }
+
+        print(f"  {action} for {symbol} -> {filepath.name} ({len(final_df)} rows)")
+
+        # --- Write per-symbol YAML manifest for this timeframe ---
+        try:
+            manifest_path = self._write_manifest(symbol, symbol_dir, timeframe, final_df, new_rows)
+            print(f"  Updated manifest for {symbol}: {manifest_path}")
+        except Exception as e:
+            print(f"  Failed to write manifest for {symbol}: {e}")
+
+        return entry
+
     def save_data(self, data_dict: Dict[str, pd.DataFrame], timeframe: str):
-        """Save data to CSV files with metadata"""
+        """Save data to per-symbol Parquet files with metadata"""
         # Use a stable filename per symbol/timeframe to avoid creating many timestamped files
         fetch_timestamp = datetime.utcnow().strftime("%Y%m%d_%H%M%S")
 
@@ -434,137 +783,25 @@ class CryptoDataFetcher:
 
         print(f"\nSaving data to {self.data_dir} ...")
 
+        # Symbols are independent (own file and manifest), so their writes, hashing and stats
+        # overlap on a thread pool. Symbols sharing a folder (e.g. BTC/USDT and BTC/USDC share
+        # manifest_<tf>.yaml) stay in one task, in input order.
+        groups: Dict[str, List[Tuple[str, pd.DataFrame]]] = {}
         for symbol, df in data_dict.items():
-            if df.empty:
-                continue
+            if not df.empty:
+                groups.setdefault(symbol.split('/')[0], []).append((symbol, df))
 
-            safe_symbol = symbol.replace('/', '_')
-            filename = f"crypto_{safe_symbol}_{timeframe}.csv"  # stable filename
-            base = symbol.split('/')[0]
-            symbol_dir = self.data_dir / base
-            symbol_dir.mkdir(parents=True, exist_ok=True)
-            filepath = symbol_dir / filename
+        def save_group(items):
+            return [(symbol, self._save_one(symbol, df, timeframe)) for symbol, df in items]
 
-            # If a file already exists, read and append only missing rows
-            if filepath.exists():
-                existing = pd.read_csv(filepath, index_col='datetime', parse_dates=True)
-                # Only keep new rows beyond the last timestamp in existing file
-                last_ts = existing.index[-1]
-                new_rows = df[df.index > last_ts]
-                if not new_rows.empty:
-                    combined = pd.concat([existing, new_rows])
-                    combined = combined[~combined.index.duplicated(keep='last')]
-                    combined.sort_index(inplace=True)
-                    combined.to_csv(filepath)
-                    final_df = combined
-                    action = f"appended {len(new_rows)} rows"
-                else:
-                    final_df = existing
-                    action = "no new rows"
-            else:
-                # Write new file
-                df.to_csv(filepath)
-                final_df = df
-                action = f"wrote {len(df)} rows"
-
-            # Calculate file hash for integrity
-            with open(filepath, 'rb') as f:
-                file_hash = hashlib.md5(f.read()).hexdigest()
-
-            manifest['symbols'][symbol] = {
-                'filename': filename,
-                'rows': len(final_df),
-                'start_date': final_df.index[0].isoformat(),
-                'end_date': final_df.index[-1].isoformat(),
-                'hash': file_hash,
-                'subfolder': base
-            }
-
-            manifest['total_symbols'] += 1
-            manifest['total_rows'] += len(final_df)
-
-            print(f"  {action} for {symbol} -> {filepath.name} ({len(final_df)} rows)")
-
-            # --- Write per-symbol YAML manifest for this timeframe ---
-            # Use same field descriptions as validator
-            field_descriptions = {
-                'open': 'Open price for the interval',
-                'high': 'Highest trade price during the interval',
-                'low': 'Lowest trade price during the interval',
-                'close': 'Close price for the interval',
-                'volume': 'Traded volume during the interval'
-            }
-
-            # Build fields stats
-            fields = {}
-            for col in ['open', 'high', 'low', 'close', 'volume']:
-                if col not in final_df.columns:
-                    continue
-                s = final_df[col].dropna()
-                fields[col] = {
-                    'name': col,
-                    'description': field_descriptions.get(col, ''),
-                    'min': float(s.min()) if not s.empty else None,
-                    'max': float(s.max()) if not s.empty else None,
-                    'mean': float(s.mean()) if not s.empty else None,
-                    'median': float(s.median()) if not s.empty else None,
-                    'std': float(s.std()) if not s.empty else None,
-                    'nulls': int(final_df[col].isnull().sum())
-                }
+        with ThreadPoolExecutor(max_workers=max(1, min(self.max_workers, len(groups)))) as ex:
+            saved = dict(pair for entries in ex.map(save_group, groups.values()) for pair in entries)
 
-            total_return_pct = None
-            try:
-                if 'close' in final_df.columns and len(final_df['close']) >= 2:
-                    total_return_pct = float((final_df['close'].iloc[-1] / final_df['close'].iloc[0] - 1) * 100)
-            except Exception:
-                total_return_pct = None
-
-            insights = {
-                'price_range': {
-                    'min_close': fields.get('close', {}).get('min'),
-                    'max_close': fields.get('close', {}).get('max')
-                },
-                'avg_volume': fields.get('volume', {}).get('mean') if fields.get('volume') else None
-            }
-
-            symbol_meta = {
-                'symbol': symbol,
-                'timeframe': timeframe,
-                'rows': int(len(final_df)),
-                'start_date': str(final_df.index[0]),
-                'end_date': str(final_df.index[-1]),
-                'total_return_pct': total_return_pct
-            }
-
-            # Write YAML manifest manually to avoid adding a dependency
-            manifest_path = symbol_dir / f"manifest_{timeframe}.yaml"
-            try:
-                with open(manifest_path, 'w', encoding='utf-8') as mf:
-                    mf.write(f"symbol: {symbol}\n")
-                    mf.write(f"timeframe: {timeframe}\n")
-                    mf.write(f"rows: {symbol_meta['rows']}\n")
-                    mf.write(f"start_date: '{symbol_meta['start_date']}'\n")
-                    mf.write(f"end_date: '{symbol_meta['end_date']}'\n")
-                    mf.write(f"total_return_pct: {symbol_meta['total_return_pct']}\n")
-                    mf.write("fields:\n")
-                    for col, meta in fields.items():
-                        mf.write(f"  {col}:\n")
-                        mf.write(f"    name: {meta['name']}\n")
-                        mf.write(f"    description: '{meta['description']}'\n")
-                        mf.write(f"    min: {meta['min']}\n")
-                        mf.write(f"    max: {meta['max']}\n")
-                        mf.write(f"    mean: {meta['mean']}\n")
-                        mf.write(f"    median: {meta['median']}\n")
-                        mf.write(f"    std: {meta['std']}\n")
-                        mf.write(f"    nulls: {meta['nulls']}\n")
-                    mf.write("insights:\n")
-                    mf.write("  price_range:\n")
-                    mf.write(f"    min_close: {insights['price_range']['min_close']}\n")
-                    mf.write(f"    max_close: {insights['price_range']['max_close']}\n")
-                    mf.write(f"  avg_volume: {insights['avg_volume']}\n")
-                print(f"  Updated manifest for {symbol}: {manifest_path}")
-            except Exception as e:
-                print(f"  Failed to write manifest for {symbol}: {e}")
+        for symbol in data_dict:
+            if symbol in saved:
+                manifest['symbols'][symbol] = saved[symbol]
+                manifest['total_symbols'] += 1
+                manifest['total_rows'] += saved[symbol]['rows']
 
         # NOTE: We do not write a JSON manifest here because per-symbol YAML manifests
         # are the canonical source of metadata for each symbol (validator writes them).
@@ -7,8 +7,193 @@ import pandas as pd
 import numpy as np
 import json
 import hashlib
+import functools
+import os
+import shutil
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from datetime import datetime
+from typing import Dict, List, Optional
+
+# The hashes only detect changed files, so a fast non-cryptographic xxh3 is enough;
+# fall back to BLAKE2b-128 (what the fetcher writes) when xxhash isn't installed
+try:
+    from xxhash import xxh3_64 as _new_hasher
+except ImportError:
+    def _new_hasher():
+        return hashlib.blake2b(digest_size=16)
+
+HASH_CACHE_NAME = '.hash_cache.json'
+_HASHER_NAME = getattr(_new_hasher(), 'name', 'xxh3_64')
+OHLCV_COLUMNS = ['open', 'high', 'low', 'close', 'volume']
+CRYPTO_DTYPES = {col: 'float64' for col in OHLCV_COLUMNS}
+
+##command
+
+def _ohlcv_path(symbol_dir: Path, base: str, timeframe: str) -> Path:
+    """Per-symbol data file: the Parquet file when present, else the legacy CSV of the same name"""
+    filepath = symbol_dir / f"crypto_{base}_USDT_{timeframe}.parquet"
+    return filepath if filepath.exists() else filepath.with_suffix('.csv')
+
+
+def _symbol_base(filename: str) -> Optional[str]:
+    """BASE from a crypto_<BASE>_USDT_<tf>.<ext> file name (None for other names)"""
+    stem = Path(filename).stem
+    if stem.startswith('crypto_') and '_USDT_' in stem:
+        return stem[len('crypto_'):stem.rindex('_USDT_')]
+    return None
+
+
+@functools.lru_cache(maxsize=None)
+def _file_index(data_dir: Path) -> Dict[str, Path]:
+    """File name -> first path under data_dir, from one os.scandir walk (built once per process)"""
+    index = {}
+    stack = [data_dir]
+    while stack:
+        subdirs = []
+        with os.scandir(stack.pop()) as it:
+            for entry in it:
+                if entry.is_dir():
+                    subdirs.append(Path(entry.path))
+                else:
+                    index.setdefault(entry.name, Path(entry.path))
+        stack.extend(reversed(subdirs))
+    return index
+
+
+def _find_data_file(data_dir: Path, filename: str, subfolder: Optional[str] = None) -> Optional[Path]:
+    """Locate a manifest entry's file, preferring its Parquet counterpart.
+
+    The per-symbol folder (`subfolder`, else the BASE in the file name) and data_dir itself are
+    checked directly; only a file stored somewhere unexpected falls back to the cached tree index.
+    """
+    base = subfolder or _symbol_base(filename)
+    dirs = [data_dir / base, data_dir] if base else [data_dir]
+    # Parquet first, then the name as given, then a legacy CSV of the same stem
+    names = dict.fromkeys((Path(filename).with_suffix('.parquet').name, filename, Path(filename).with_suffix('.csv').name))
+    for name in names:
+        for d in dirs:
+            if (d / name).exists():
+                return d / name
+    index = _file_index(data_dir)
+    for name in names:
+        if name in index:
+            return index[name]
+    return None
+
+
+def _file_hash(filepath: Path, chunk_size: int = 1 << 20) -> str:
+    """Hex digest of a file, streamed in 1 MiB chunks instead of reading it whole"""
+    h = _new_hasher()
+    with open(filepath, 'rb', buffering=0) as f:
+        for chunk in iter(lambda: f.read(chunk_size), b''):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+def _load_hash_cache(data_dir: Path) -> Dict[str, list]:
+    """Digests from earlier runs (see _cached_hash); empty if missing, unreadable or from another hasher"""
+    try:
+        with open(data_dir / HASH_CACHE_NAME, 'r') as f:
+            cache = json.load(f)
+    except (OSError, ValueError):
+        return {}
+    return cache.get('files', {}) if cache.get('hasher') == _HASHER_NAME else {}
+
+
+def _save_hash_cache(data_dir: Path, cache: Dict[str, list]):
+    with open(data_dir / HASH_CACHE_NAME, 'w') as f:
+        json.dump({'hasher': _HASHER_NAME, 'files': cache}, f, indent=1, sort_keys=True)
+
+
+def _cached_hash(filepath: Path, data_dir: Path, cache: Dict[str, list]) -> str:
+    """_file_hash, reused from `cache` while the file's (path, mtime_ns, size) are unchanged"""
+    st = filepath.stat()
+    key = filepath.relative_to(data_dir).as_posix()
+    entry = cache.get(key)
+    if entry is not None and entry[0] == st.st_mtime_ns and entry[1] == st.st_size:
+        return entry[2]
+    digest = _file_hash(filepath)
+    cache[key] = [st.st_mtime_ns, st.st_size, digest]
+    return digest
+
+
+def _read_ohlcv(filepath: Path, columns: Optional[List[str]] = None) -> pd.DataFrame:
+    """Load a per-symbol OHLCV file indexed by datetime.
+
+    Parquet is preferred (also when `filepath` names the legacy .csv) since floats and timestamps
+    are stored binary; `columns` limits the read to what the caller needs. Legacy CSVs are parsed
+    with the same float64 dtypes the Parquet files carry, minus the old `symbol` column.
+    """
+    parquet = Path(filepath).with_suffix('.parquet')
+    if parquet.exists():
+        return pd.read_parquet(parquet, engine='pyarrow', columns=columns)
+    # Explicit dtypes skip per-file type inference; the pyarrow engine parses in bulk across threads
+    usecols = None if columns is None else ['datetime', *columns]
+    df = pd.read_csv(parquet.with_suffix('.csv'), usecols=usecols,
+                     dtype={'datetime': 'datetime64[ns]', **CRYPTO_DTYPES}, engine='pyarrow').set_index('datetime')
+    df = df.drop(columns='symbol', errors='ignore')
+    return df if columns is None else df[columns]
+
+
+@functools.lru_cache(maxsize=None)
+def _load_frame(filepath: Path, mtime_ns: int) -> pd.DataFrame:
+    return _read_ohlcv(filepath)
+
+
+def _cached_ohlcv(filepath: Path) -> pd.DataFrame:
+    """_read_ohlcv memoized per file (and mtime), so the summary and combined stages parse each file once.
+
+    The frame is shared between callers and must not be modified in place.
+    """
+    return _load_frame(Path(filepath), os.stat(filepath).st_mtime_ns)
+
+
+def _any_less(a: np.ndarray, b, block: int = 1 << 16) -> bool:
+    """Whether any a[i] < b[i] (b may be a scalar), returning at the first block that has one.
+
+    Blocks are compared into one reused bool buffer, so no full-length mask is allocated and a
+    violation near the start doesn't pay for a scan of the whole array.
+    """
+    buf = np.empty(min(block, len(a)), dtype=bool)
+    for start in range(0, len(a), block):
+        stop = min(start + block, len(a))
+        out = buf[:stop - start]
+        np.less(a[start:stop], b if np.isscalar(b) else b[start:stop], out=out)
+        if out.any():
+            return True
+    return False
+
+
+def _write_partitioned(combined: pd.DataFrame, path: Path):
+    """Write a combined (symbol, datetime)-indexed frame as a zstd Parquet dataset with one partition per symbol.
+
+    Readers can then load a slice without touching the rest, e.g.
+    pd.read_parquet(path, filters=[('symbol', '==', 'BTC/USDT')], columns=['close', 'volume']).
+    The dataset is rewritten from scratch so partitions of dropped symbols don't linger.
+    """
+    if path.exists():
+        shutil.rmtree(path)
+    combined.to_parquet(path, engine='pyarrow', compression='zstd', partition_cols=['symbol'])
+
+
+def convert_csv_to_parquet(data_dir: Path = Path("data") / "crypto" / "USDT", remove_csv: bool = False) -> List[Path]:
+    """One-time migration: rewrite each crypto_<BASE>_USDT_<tf>.csv as a zstd Parquet file next to it.
+
+    Symbols that already have a Parquet file are skipped, so this is a no-op once every file is migrated.
+    """
+    written = []
+    for csv_path in sorted(data_dir.glob("*/crypto_*_USDT_*.csv")):
+        parquet_path = csv_path.with_suffix('.parquet')
+        if parquet_path.exists():
+            continue
+        df = _read_ohlcv(csv_path)
+        df.to_parquet(parquet_path, engine='pyarrow', compression='zstd')
+        if remove_csv:
+            csv_path.unlink()
+        written.append(parquet_path)
+        print(f"   Converted {csv_path.name} -> {parquet_path.name}")
+    return written
 
 ##command
 
@@ -30,20 +215,21 @@ def load_crypto_data_summary():
                 manifest = json.load(f)
             manifests.append(manifest)
     else:
-        # Build manifests for 1h and 1d if stable CSV files exist under symbol folders
+        # Build manifests for 1h and 1d if stable data files exist under symbol folders
+        hash_cache = _load_hash_cache(data_dir)
+        cached = dict(hash_cache)
         for timeframe in ['1h', '1d']:
             symbols = {}
             total_rows = 0
             for symbol_dir in sorted([p for p in data_dir.iterdir() if p.is_dir()], key=lambda p: p.name):
                 base = symbol_dir.name
-                filename = f"crypto_{base}_USDT_{timeframe}.csv"
-                filepath = symbol_dir / filename
+                filepath = _ohlcv_path(symbol_dir, base, timeframe)
                 if filepath.exists():
-                    df = pd.read_csv(filepath, index_col='datetime', parse_dates=True)
-                    with open(filepath, 'rb') as fh:
-                        file_hash = hashlib.md5(fh.read()).hexdigest()
+                    # Only the index is needed for rows / date range
+                    df = _read_ohlcv(filepath, columns=['close'])
+                    file_hash = _cached_hash(filepath, data_dir, hash_cache)
                     symbols[f"{base}/USDT"] = {
-                        'filename': filename,
+                        'filename': filepath.name,
                         'rows': len(df),
                         'start_date': df.index[0].isoformat(),
                         'end_date': df.index[-1].isoformat(),
@@ -63,61 +249,68 @@ def load_crypto_data_summary():
                 }
                 manifests.append(manifest)
 
-        for manifest in manifests:
-            print(f"\n{manifest['timeframe'].upper()} Data ({manifest.get('exchange','unknown')})")
-            print(f"   Fetched: {manifest.get('fetch_timestamp','n/a')}")
-            print(f"   Symbols: {manifest.get('total_symbols', len(manifest.get('symbols', {}))) }")
-            print(f"   Total rows: {manifest.get('total_rows', 0):,}")
+        if hash_cache != cached:
+            _save_hash_cache(data_dir, hash_cache)
+
+    if not manifests:
+        print("No crypto data files found")
+        return
 
-            # Load one sample file to check data quality
-            sample_symbol = list(manifest['symbols'].keys())[0]
-            sample_file = manifest['symbols'][sample_symbol]['filename']
-            # Resolve sample path by searching per-symbol subfolders
-            matches = list(data_dir.rglob(sample_file))
-            if matches:
-                sample_path = matches[0]
-            else:
-                raise FileNotFoundError(f"Sample file not found: {sample_file} under {data_dir}")
+    for manifest in manifests:
+        print(f"\n{manifest['timeframe'].upper()} Data ({manifest.get('exchange','unknown')})")
+        print(f"   Fetched: {manifest.get('fetch_timestamp','n/a')}")
+        print(f"   Symbols: {manifest.get('total_symbols', len(manifest.get('symbols', {}))) }")
+        print(f"   Total rows: {manifest.get('total_rows', 0):,}")
 
-        df = pd.read_csv(sample_path, index_col='datetime', parse_dates=True)
+        # Load one sample file to check data quality
+        sample_symbol = list(manifest['symbols'].keys())[0]
+        sample_file = manifest['symbols'][sample_symbol]['filename']
+        # Resolve sample path in its per-symbol subfolder
+        sample_path = _find_data_file(data_dir, sample_file, manifest['symbols'][sample_symbol].get('subfolder'))
+        if sample_path is None:
+            raise FileNotFoundError(f"Sample file not found: {sample_file} under {data_dir}")
 
-        print(f"\n   Sample ({sample_symbol}):")
-        print(f"   - Date range: {df.index[0]} to {df.index[-1]}")
-        print(f"   - Rows: {len(df):,}")
-        print(f"   - Columns: {list(df.columns)}")
-        print(f"   - Price range: ${df['close'].min():.2f} - ${df['close'].max():.2f}")
-        print(f"   - Avg daily volume: {df['volume'].mean():,.0f}")
-        print(f"   - Missing values: {df.isnull().sum().sum()}")
+    df = _cached_ohlcv(sample_path)[OHLCV_COLUMNS]
 
-        # Basic statistics
-        returns = df['close'].pct_change().dropna()
-        total_return = (df['close'].iloc[-1] / df['close'].iloc[0] - 1) * 100
+    print(f"\n   Sample ({sample_symbol}):")
+    print(f"   - Date range: {df.index[0]} to {df.index[-1]}")
+    print(f"   - Rows: {len(df):,}")
+    print(f"   - Columns: {list(df.columns)}")
+    print(f"   - Price range: ${df['close'].min():.2f} - ${df['close'].max():.2f}")
+    print(f"   - Avg daily volume: {df['volume'].mean():,.0f}")
+    print(f"   - Missing values: {df.isnull().sum().sum()}")
 
-        print(f"   - Total return: {total_return:.1f}%")
-        print(f"   - Daily volatility: {returns.std() * 100:.2f}%")
+    # Basic statistics
+    returns = df['close'].pct_change().dropna()
+    total_return = (df['close'].iloc[-1] / df['close'].iloc[0] - 1) * 100
 
-        # Data integrity checks
-        integrity_issues = []
+    print(f"   - Total return: {total_return:.1f}%")
+    print(f"   - Daily volatility: {returns.std() * 100:.2f}%")
 
-        if df.index.duplicated().any():
-            integrity_issues.append("Duplicate timestamps")
+    # Data integrity checks
+    integrity_issues = []
 
-        if (df['high'] < df['low']).any():
-            integrity_issues.append("High < Low")
+    if df.index.duplicated().any():
+        integrity_issues.append("Duplicate timestamps")
 
-        if (df['high'] < df['open']).any() or (df['high'] < df['close']).any():
-            integrity_issues.append("High < Open/Close")
+    # Each rule stops at the first violating block (see _any_less)
+    o, h, l, c, v = (df[col].to_numpy() for col in OHLCV_COLUMNS)
+    if _any_less(h, l):
+        integrity_issues.append("High < Low")
 
-        if (df['low'] > df['open']).any() or (df['low'] > df['close']).any():
-            integrity_issues.append("Low > Open/Close")
+    if _any_less(h, o) or _any_less(h, c):
+        integrity_issues.append("High < Open/Close")
 
-        if (df['volume'] < 0).any():
-            integrity_issues.append("Negative volume")
+    if _any_less(o, l) or _any_less(c, l):
+        integrity_issues.append("Low > Open/Close")
 
-        if integrity_issues:
-            print(f"   Issues: {', '.join(integrity_issues)}")
-        else:
-            print(f"   Data integrity: PASS")
+    if _any_less(v, 0):
+        integrity_issues.append("Negative volume")
+
+    if integrity_issues:
+        print(f"   Issues: {', '.join(integrity_issues)}")
+    else:
+        print(f"   Data integrity: PASS")
 
 ##command
 
@@ -127,15 +320,32 @@ def create_combined_dataset():
 
     print(f"\nCreating combined datasets...")
 
-    # Helper that resolves file paths (handles per-symbol subfolders)
-    def _resolve_filepath(filename: str) -> Path:
-        candidate = data_dir / filename
-        if candidate.exists():
-            return candidate
-        matches = list(data_dir.rglob(filename))
-        if matches:
-            return matches[0]
-        raise FileNotFoundError(f"File not found: {filename} under {data_dir}")
+    # Symbols are independent reads; load them on a thread pool and keep manifest order
+    def _load_symbol_frames(manifest) -> Dict[str, pd.DataFrame]:
+        items = list(manifest['symbols'].items())
+
+        def _load_symbol(item):
+            symbol, file_info = item
+            filepath = _find_data_file(data_dir, file_info['filename'], file_info.get('subfolder'))
+            if filepath is None:
+                return symbol, file_info, None
+            return symbol, file_info, _cached_ohlcv(filepath)
+
+        with ThreadPoolExecutor(max_workers=max(1, min(32, len(items)))) as ex:
+            results = list(ex.map(_load_symbol, items))
+        frames = {}
+        for symbol, file_info, df in results:
+            if df is None:
+                print(f"Missing file for {symbol}: {file_info['filename']}")
+                continue
+            frames[symbol] = df
+        return frames
+
+    def _combine(frames: Dict[str, pd.DataFrame]) -> pd.DataFrame:
+        # Keys make the symbol the outer index level: one small-integer code per row into a
+        # categorical of the symbols, with no per-frame symbol column to materialize first
+        return pd.concat(list(frames.values()), keys=pd.CategoricalIndex(list(frames)),
+                         names=['symbol', 'datetime'], copy=False, sort=False)
 
     # Load hourly manifest (fallback to scanning per-symbol dirs)
     hourly_manifest_files = list(data_dir.glob("crypto_manifest_1h_*.json"))
@@ -143,37 +353,25 @@ def create_combined_dataset():
         with open(hourly_manifest_files[0], 'r') as f:
             hourly_manifest = json.load(f)
     else:
-        # Build hourly manifest by scanning per-symbol folders for stable CSVs
+        # Build hourly manifest by scanning per-symbol folders for stable data files
         symbols = {}
         for symbol_dir in sorted([p for p in data_dir.iterdir() if p.is_dir()], key=lambda p: p.name):
             base = symbol_dir.name
-            filename = f"crypto_{base}_USDT_1h.csv"
-            matches = list(data_dir.rglob(filename))
-            if not matches:
+            filepath = _ohlcv_path(symbol_dir, base, '1h')
+            if not filepath.exists():
                 continue
-            filepath = matches[0]
-            df = pd.read_csv(filepath, index_col='datetime', parse_dates=True)
             symbols[f"{base}/USDT"] = {'filename': filepath.name}
         hourly_manifest = {'symbols': symbols}
 
     # Combine hourly data
-    all_hourly_data = []
-    for symbol, file_info in hourly_manifest['symbols'].items():
-        try:
-            filepath = _resolve_filepath(file_info['filename'])
-        except FileNotFoundError:
-            print(f"Missing file for {symbol}: {file_info['filename']}")
-            continue
-        df = pd.read_csv(filepath, index_col='datetime', parse_dates=True)
-        df['symbol'] = symbol
-        all_hourly_data.append(df)
+    all_hourly_data = _load_symbol_frames(hourly_manifest)
 
     if all_hourly_data:
-        combined_hourly = pd.concat(all_hourly_data)
+        combined_hourly = _combine(all_hourly_data)
         combined_dir = data_dir / "combined"
         combined_dir.mkdir(parents=True, exist_ok=True)
-        combined_hourly_file = combined_dir / "crypto_combined_1h.csv"
-        combined_hourly.to_csv(combined_hourly_file)
+        combined_hourly_file = combined_dir / "crypto_combined_1h.parquet"
+        _write_partitioned(combined_hourly, combined_hourly_file)
         print(f"   Combined hourly: {len(combined_hourly):,} rows -> {combined_hourly_file}")
 
     # Load daily manifest (fallback to scanning per-symbol dirs)
@@ -185,37 +383,29 @@ def create_combined_dataset():
         symbols = {}
         for symbol_dir in sorted([p for p in data_dir.iterdir() if p.is_dir()], key=lambda p: p.name):
             base = symbol_dir.name
-            filename = f"crypto_{base}_USDT_1d.csv"
-            matches = list(data_dir.rglob(filename))
-            if not matches:
+            filepath = _ohlcv_path(symbol_dir, base, '1d')
+            if not filepath.exists():
                 continue
-            filepath = matches[0]
             symbols[f"{base}/USDT"] = {'filename': filepath.name}
         daily_manifest = {'symbols': symbols}
 
     # Combine daily data
-    all_daily_data = []
-    for symbol, file_info in daily_manifest['symbols'].items():
-        try:
-            filepath = _resolve_filepath(file_info['filename'])
-        except FileNotFoundError:
-            print(f"Missing file for {symbol}: {file_info['filename']}")
-            continue
-        df = pd.read_csv(filepath, index_col='datetime', parse_dates=True)
-        df['symbol'] = symbol
-        all_daily_data.append(df)
+    all_daily_data = _load_symbol_frames(daily_manifest)
 
     if all_daily_data:
-        combined_daily = pd.concat(all_daily_data)
+        combined_daily = _combine(all_daily_data)
         combined_dir = data_dir / "combined"
         combined_dir.mkdir(parents=True, exist_ok=True)
-        combined_daily_file = combined_dir / "crypto_combined_1d.csv"
-        combined_daily.to_csv(combined_daily_file)
+        combined_daily_file = combined_dir / "crypto_combined_1d.parquet"
+        _write_partitioned(combined_daily, combined_daily_file)
         print(f"   Combined daily: {len(combined_daily):,} rows -> {combined_daily_file}")
 
 ##command
 
 if __name__ == "__main__":
+    # Migrate any legacy CSVs (no-op once every symbol has a Parquet file)
+    convert_csv_to_parquet()
+
     # Load and summarize data
     load_crypto_data_summary()
     
@@ -6,17 +6,136 @@ Day 2 of Phase 0: Continue data pulls; ensure consistent date indices and schema
 
 import pandas as pd
 import numpy as np
+import pyarrow.parquet as pq
 import json
 import os
 import hashlib
+import mmap
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 import matplotlib.pyplot as plt
 import seaborn as sns
 from datetime import datetime, timedelta
-from typing import Dict, List, Tuple
+from typing import Dict, List, Optional, Tuple
 import warnings
+import yaml
 warnings.filterwarnings('ignore')
 
+# libyaml's C emitter when available; same output as safe_dump, much faster
+try:
+    from yaml import CSafeDumper as _YamlDumper
+except ImportError:
+    from yaml import SafeDumper as _YamlDumper
+
+# The hashes only detect changed files, so a fast non-cryptographic xxh3 is enough;
+# fall back to BLAKE2b-128 (what the fetcher writes) when xxhash isn't installed
+try:
+    from xxhash import xxh3_64 as _new_hasher
+except ImportError:
+    def _new_hasher():
+        return hashlib.blake2b(digest_size=16)
+
+HASH_CACHE_NAME = '.hash_cache.json'
+_HASHER_NAME = getattr(_new_hasher(), 'name', 'xxh3_64')
+CRYPTO_DTYPES = {'open': 'float64', 'high': 'float64', 'low': 'float64', 'close': 'float64', 'volume': 'float64'}
+
+# Integrity-rule bits produced by CryptoDataValidator._integrity_flags
+OHLC_RULES = [(1, "High < Open"), (2, "High < Close"), (4, "Low > Open"), (8, "Low > Close")]
+NEGATIVE_VOLUME = 16
+
+##command
+
+def _file_hash(filepath: Path) -> str:
+    """Hex digest of a file, hashed straight from a read-only memory map (no copies into Python bytes)"""
+    h = _new_hasher()
+    with open(filepath, 'rb') as f:
+        if os.fstat(f.fileno()).st_size:  # empty files can't be mapped
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                h.update(mm)
+    return h.hexdigest()
+
+
+def _peek_ohlcv(filepath: Path) -> Tuple[int, pd.Timestamp, pd.Timestamp]:
+    """Row count and first/last timestamps of a per-symbol file without loading the frame.
+
+    Parquet only decodes the datetime column. Legacy CSVs are memory-mapped: newlines are counted
+    with NumPy over the mapped bytes and only the first and last data lines are parsed. Anything
+    unexpected (no datetime column / no data rows) goes through _read_ohlcv as before.
+    """
+    if filepath.suffix == '.parquet':
+        meta = pq.read_metadata(filepath)
+        if 'datetime' in meta.schema.names:
+            index = pq.read_table(filepath, columns=['datetime']).column('datetime').to_numpy()
+            if len(index):
+                return len(index), pd.Timestamp(index[0]), pd.Timestamp(index[-1])
+    elif os.path.getsize(filepath):
+        with open(filepath, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            end = len(mm)
+            while end and mm[end - 1] in (0x0A, 0x0D):  # ignore trailing newlines
+                end -= 1
+            header_end = mm.find(b'\n')
+            if 0 <= header_end < end and mm[:header_end].split(b',', 1)[0].strip() == b'datetime':
+                first_end = mm.find(b'\n', header_end + 1, end)
+                first = mm[header_end + 1:first_end if first_end >= 0 else end]
+                last = mm[mm.rfind(b'\n', 0, end) + 1:end]
+                newlines = np.frombuffer(mm, dtype=np.uint8, count=end)
+                # Newlines up to `end` delimit header + rows, minus one for the unterminated last row
+                rows = int(np.count_nonzero(newlines == 0x0A))
+                del newlines  # release the buffer before the map is closed
+                return (rows, pd.Timestamp(first.split(b',', 1)[0].decode()),
+                        pd.Timestamp(last.split(b',', 1)[0].decode()))
+    df = _read_ohlcv(filepath, columns=['close'])
+    return len(df), df.index[0], df.index[-1]
+
+
+def _load_hash_cache(data_dir: Path) -> Dict[str, list]:
+    """Digests from earlier runs (see _cached_hash); empty if missing, unreadable or from another hasher"""
+    try:
+        with open(data_dir / HASH_CACHE_NAME, 'r') as f:
+            cache = json.load(f)
+    except (OSError, ValueError):
+        return {}
+    return cache.get('files', {}) if cache.get('hasher') == _HASHER_NAME else {}
+
+
+def _save_hash_cache(data_dir: Path, cache: Dict[str, list]):
+    with open(data_dir / HASH_CACHE_NAME, 'w') as f:
+        json.dump({'hasher': _HASHER_NAME, 'files': cache}, f, indent=1, sort_keys=True)
+
+
+def _cached_hash(filepath: Path, data_dir: Path, cache: Dict[str, list]) -> str:
+    """_file_hash, reused from `cache` while the file's (path, mtime_ns, size) are unchanged"""
+    st = filepath.stat()
+    key = filepath.relative_to(data_dir).as_posix()
+    entry = cache.get(key)
+    if entry is not None and entry[0] == st.st_mtime_ns and entry[1] == st.st_size:
+        return entry[2]
+    digest = _file_hash(filepath)
+    cache[key] = [st.st_mtime_ns, st.st_size, digest]
+    return digest
+
+
+def _read_ohlcv(filepath: Path, columns: Optional[List[str]] = None, dtype: Optional[str] = None) -> pd.DataFrame:
+    """Load a per-symbol OHLCV file indexed by datetime.
+
+    Parquet is preferred (also when `filepath` names the legacy .csv) since floats and timestamps
+    are stored binary; `columns` limits the read to what the caller needs. Legacy CSVs are parsed
+    with the same float64 dtypes the Parquet files carry, minus the old `symbol` column.
+    `dtype` (e.g. 'float32') narrows the OHLCV columns once at load, halving the bytes every
+    later pass moves; CSVs are parsed straight into it.
+    """
+    parquet = Path(filepath).with_suffix('.parquet')
+    if parquet.exists():
+        df = pd.read_parquet(parquet, engine='pyarrow', columns=columns)
+        return df if dtype is None else df.astype(dtype, copy=False)
+    # Explicit dtypes skip per-file type inference; the pyarrow engine parses in bulk across threads
+    usecols = None if columns is None else ['datetime', *columns]
+    float_dtypes = CRYPTO_DTYPES if dtype is None else dict.fromkeys(CRYPTO_DTYPES, dtype)
+    df = pd.read_csv(parquet.with_suffix('.csv'), usecols=usecols,
+                     dtype={'datetime': 'datetime64[ns]', **float_dtypes}, engine='pyarrow').set_index('datetime')
+    df = df.drop(columns='symbol', errors='ignore')
+    return df if columns is None else df[columns]
+
 ##command
 
 class CryptoDataValidator:
@@ -25,11 +144,16 @@ class CryptoDataValidator:
     Ensures consistent date indices and schemas across all data files
     """
     
-    def __init__(self, data_dir: str = "data"):
+    def __init__(self, data_dir: str = "data", float_dtype: Optional[str] = None):
         # Point to new crypto layout by default
         self.data_dir = Path(data_dir) / "crypto" / "USDT"
+        # e.g. 'float32' to load OHLCV narrower (less memory traffic, ~7 significant digits);
+        # None keeps the files' float64
+        self.float_dtype = float_dtype
         self.hourly_manifest = None
         self.daily_manifest = None
+        self._file_index = None  # built lazily by _resolve_data_file
+        self._cache: Dict[Path, pd.DataFrame] = {}  # parsed frames, shared by every stage (see _load_frame)
         self.load_manifests()
     
     def load_manifests(self):
@@ -49,40 +173,26 @@ class CryptoDataValidator:
                     print(f"Found daily manifest: {manifest.get('total_symbols')} symbols, {manifest.get('total_rows')} rows")
         else:
             # No global JSON manifests found — build manifests by scanning per-symbol folders
-            hourly = {'exchange': self.exchange_name, 'timeframe': '1h', 'symbols': {}, 'total_symbols': 0, 'total_rows': 0}
-            daily = {'exchange': self.exchange_name, 'timeframe': '1d', 'symbols': {}, 'total_symbols': 0, 'total_rows': 0}
-
-            for symbol_dir in sorted([p for p in self.data_dir.iterdir() if p.is_dir()], key=lambda p: p.name):
-                base = symbol_dir.name
-                # Hourly
-                hf = symbol_dir / f"crypto_{base}_USDT_1h.csv"
-                if hf.exists():
-                    df = pd.read_csv(hf, index_col='datetime', parse_dates=True)
-                    hourly['symbols'][f"{base}/USDT"] = {
-                        'filename': hf.name,
-                        'rows': len(df),
-                        'start_date': df.index[0].isoformat(),
-                        'end_date': df.index[-1].isoformat(),
-                        'hash': hashlib.md5(hf.read_bytes()).hexdigest() if hasattr(hf, 'read_bytes') else None,
-                        'subfolder': base
-                    }
-                    hourly['total_symbols'] += 1
-                    hourly['total_rows'] += len(df)
-
-                # Daily
-                dfp = symbol_dir / f"crypto_{base}_USDT_1d.csv"
-                if dfp.exists():
-                    df2 = pd.read_csv(dfp, index_col='datetime', parse_dates=True)
-                    daily['symbols'][f"{base}/USDT"] = {
-                        'filename': dfp.name,
-                        'rows': len(df2),
-                        'start_date': df2.index[0].isoformat(),
-                        'end_date': df2.index[-1].isoformat(),
-                        'hash': hashlib.md5(dfp.read_bytes()).hexdigest() if hasattr(dfp, 'read_bytes') else None,
-                        'subfolder': base
-                    }
-                    daily['total_symbols'] += 1
-                    daily['total_rows'] += len(df2)
+            hourly = {'exchange': 'binance', 'timeframe': '1h', 'symbols': {}, 'total_symbols': 0, 'total_rows': 0}
+            daily = {'exchange': 'binance', 'timeframe': '1d', 'symbols': {}, 'total_symbols': 0, 'total_rows': 0}
+
+            # Each folder is an independent read, so scan them on a thread pool (IO and
+            # pyarrow parsing release the GIL); map keeps the folder order
+            symbol_dirs = sorted([p for p in self.data_dir.iterdir() if p.is_dir()], key=lambda p: p.name)
+            hash_cache = _load_hash_cache(self.data_dir)
+            cached = dict(hash_cache)
+            with ThreadPoolExecutor(max_workers=max(1, min(32, len(symbol_dirs)))) as ex:
+                scanned = list(ex.map(lambda d: self._scan_symbol_dir(d, hash_cache), symbol_dirs))
+            if hash_cache != cached:
+                _save_hash_cache(self.data_dir, hash_cache)
+
+            for base, entries in scanned:
+                for manifest, entry in ((hourly, entries.get('1h')), (daily, entries.get('1d'))):
+                    if entry is None:
+                        continue
+                    manifest['symbols'][f"{base}/USDT"] = entry
+                    manifest['total_symbols'] += 1
+                    manifest['total_rows'] += entry['rows']
 
             if hourly['total_symbols'] > 0:
                 self.hourly_manifest = hourly
@@ -90,7 +200,79 @@ class CryptoDataValidator:
             if daily['total_symbols'] > 0:
                 self.daily_manifest = daily
                 print(f"Built daily manifest from files: {daily['total_symbols']} symbols, {daily['total_rows']} rows")
+
+    def _scan_symbol_dir(self, symbol_dir: Path, hash_cache: Dict[str, list]) -> Tuple[str, Dict[str, Dict]]:
+        """Build the 1h/1d manifest entries for one per-symbol folder (hashes go through hash_cache)"""
+        base = symbol_dir.name
+        entries = {}
+        for timeframe in ('1h', '1d'):
+            filepath = self._data_path(symbol_dir / f"crypto_{base}_USDT_{timeframe}.csv")
+            if not filepath.exists():
+                continue
+            # Only rows / date range are needed, not the data
+            rows, start, end = _peek_ohlcv(filepath)
+            entries[timeframe] = {
+                'filename': filepath.name,
+                'rows': rows,
+                'start_date': start.isoformat(),
+                'end_date': end.isoformat(),
+                'hash': _cached_hash(filepath, self.data_dir, hash_cache),
+                'subfolder': base
+            }
+        return base, entries
+
+    @staticmethod
+    def _data_path(filepath: Path) -> Path:
+        """Prefer the Parquet file over a legacy CSV of the same name"""
+        parquet = filepath.with_suffix('.parquet')
+        return parquet if parquet.exists() else filepath
+
+    def _resolve_data_file(self, filename: str, subfolder: Optional[str] = None) -> Optional[Path]:
+        """Find a manifest entry's file, preferring its Parquet counterpart.
+
+        The per-symbol folder (`subfolder`, else the BASE in crypto_<BASE>_USDT_<tf>) and the USDT
+        folder are checked directly; anything else is looked up in a file index built by a single
+        os.scandir walk the first time it is needed.
+        """
+        stem = Path(filename).stem
+        if not subfolder and stem.startswith('crypto_') and '_USDT_' in stem:
+            subfolder = stem[len('crypto_'):stem.rindex('_USDT_')]
+        dirs = [self.data_dir / subfolder, self.data_dir] if subfolder else [self.data_dir]
+        # Parquet first, then the name as given, then a legacy CSV of the same stem
+        names = dict.fromkeys((Path(filename).with_suffix('.parquet').name, filename, Path(filename).with_suffix('.csv').name))
+        for name in names:
+            for d in dirs:
+                if (d / name).exists():
+                    return d / name
+        if self._file_index is None:
+            self._file_index = self._build_file_index()
+        for name in names:
+            if name in self._file_index:
+                return self._file_index[name]
+        return None
+
+    def _build_file_index(self) -> Dict[str, Path]:
+        """File name -> first path under data_dir (top-down, like rglob)"""
+        index = {}
+        stack = [self.data_dir]
+        while stack:
+            subdirs = []
+            with os.scandir(stack.pop()) as it:
+                for entry in it:
+                    if entry.is_dir():
+                        subdirs.append(Path(entry.path))
+                    else:
+                        index.setdefault(entry.name, Path(entry.path))
+            stack.extend(reversed(subdirs))
+        return index
     
+    def _load_frame(self, filepath: Path) -> pd.DataFrame:
+        """Parse a data file once per validator; later stages get the same (read-only) frame"""
+        df = self._cache.get(filepath)
+        if df is None:
+            df = self._cache[filepath] = _read_ohlcv(filepath, dtype=self.float_dtype)
+        return df
+
     def load_crypto_data(self, timeframe: str = '1h') -> Dict[str, pd.DataFrame]:
         """
         Load all crypto data for a given timeframe
@@ -110,25 +292,27 @@ class CryptoDataValidator:
 
         print(f"\nLoading {timeframe} data...")
 
-        for symbol, file_info in manifest['symbols'].items():
-            filename = file_info['filename']
-            filepath = self.data_dir / filename
+        def _load_one(item):
+            symbol, file_info = item
+            # File may sit directly in the USDT folder or in a per-symbol subfolder
+            filepath = self._resolve_data_file(file_info['filename'], file_info.get('subfolder'))
+            if filepath is None:
+                return symbol, file_info, None
 
-            # If file isn't directly in the USDT folder, search subfolders (per-symbol dirs)
-            if not filepath.exists():
-                matches = list(self.data_dir.rglob(filename))
-                if matches:
-                    filepath = matches[0]
-                else:
-                    print(f"File not found: {filename}")
-                    continue
-            
-            # Load data
-            df = pd.read_csv(filepath, index_col='datetime', parse_dates=True)
-            
             # Verify hash if needed (optional)
             # self._verify_file_hash(filepath, file_info['hash'])
-            
+
+            return symbol, file_info, self._load_frame(filepath)
+
+        # Symbols are independent reads; load them concurrently and report in manifest order
+        items = list(manifest['symbols'].items())
+        with ThreadPoolExecutor(max_workers=max(1, min(32, len(items)))) as ex:
+            results = list(ex.map(_load_one, items))
+
+        for symbol, file_info, df in results:
+            if df is None:
+                print(f"File not found: {file_info['filename']}")
+                continue
             data_dict[symbol] = df
             print(f"  Loaded {symbol}: {len(df)} rows from {df.index[0]} to {df.index[-1]}")
         
@@ -152,7 +336,8 @@ class CryptoDataValidator:
             'data_issues': []
         }
         
-        expected_columns = ['open', 'high', 'low', 'close', 'volume', 'symbol']
+        expected_columns = ['open', 'high', 'low', 'close', 'volume']  # symbol is the dict key
+        integrity_flags = self._integrity_flags(data_dict, expected_columns)
         
         for symbol, df in data_dict.items():
             symbol_results = {
@@ -172,38 +357,37 @@ class CryptoDataValidator:
                 validation_results['schema_issues'].append(f"{symbol}: Missing columns {missing_cols}")
                 symbol_results['schema_valid'] = False
             
-            # Check OHLC logic (High >= Open, Low <= Close, etc.)
-            ohlc_issues = []
-            if (df['high'] < df['open']).any():
-                ohlc_issues.append("High < Open")
-            if (df['high'] < df['close']).any():
-                ohlc_issues.append("High < Close")
-            if (df['low'] > df['open']).any():
-                ohlc_issues.append("Low > Open")
-            if (df['low'] > df['close']).any():
-                ohlc_issues.append("Low > Close")
+            # Check OHLC logic (High >= Open, Low <= Close, etc.) and volumes from the precomputed bits
+            flags = integrity_flags[symbol]
+            ohlc_issues = [issue for bit, issue in OHLC_RULES if flags & bit]
+            negative_volume = bool(flags & NEGATIVE_VOLUME)
             
             if ohlc_issues:
                 validation_results['data_issues'].extend([f"{symbol}: {issue}" for issue in ohlc_issues])
                 symbol_results['ohlc_valid'] = False
             
             # Check for negative volumes
-            if (df['volume'] < 0).any():
+            if negative_volume:
                 validation_results['data_issues'].append(f"{symbol}: Negative volumes")
                 symbol_results['volume_valid'] = False
             
+            # Consecutive index deltas as a raw timedelta64 array (no Timedelta Series); they
+            # give both the monotonic check and the frequency check
+            time_diffs = np.diff(df.index.to_numpy())
+
             # Check date index consistency
-            if not df.index.is_monotonic_increasing:
+            if not (time_diffs >= np.timedelta64(0)).all():
                 validation_results['date_issues'].append(f"{symbol}: Non-monotonic dates")
             
             # Check for expected frequency
             if timeframe == '1h':
-                expected_freq = pd.Timedelta(hours=1)
+                expected_freq = np.timedelta64(1, 'h')
             elif timeframe == '1d':
-                expected_freq = pd.Timedelta(days=1)
+                expected_freq = np.timedelta64(1, 'D')
             
-            time_diffs = df.index.to_series().diff().dropna()
-            irregular_freq = (time_diffs != expected_freq).sum()
+            if df.index.hasnans:
+                time_diffs = time_diffs[~np.isnat(time_diffs)]
+            irregular_freq = int(np.count_nonzero(time_diffs != expected_freq))
             if irregular_freq > 0:
                 validation_results['date_issues'].append(f"{symbol}: {irregular_freq} irregular time intervals")
             
@@ -211,51 +395,104 @@ class CryptoDataValidator:
         
         return validation_results
     
+    @staticmethod
+    def _integrity_flags(data_dict: Dict[str, pd.DataFrame], columns: List[str]) -> Dict[str, int]:
+        """Per-symbol OHLC/volume rule violations as a bitmask (see OHLC_RULES / NEGATIVE_VOLUME).
+
+        All symbols are stacked into one contiguous array per column, so each rule is evaluated in a
+        single pass over every row; np.bitwise_or.reduceat then folds the per-row bits per symbol.
+        """
+        symbols = list(data_dict)
+        lengths = np.array([len(data_dict[s]) for s in symbols], dtype=np.intp)
+        per_symbol = np.zeros(len(symbols), dtype=np.uint8)
+        if lengths.sum():
+            o, h, l, c, v = (np.concatenate([data_dict[s][col].to_numpy() for s in symbols])
+                             for col in columns)
+            # Each rule is compared into one reused mask and OR-ed into the bits in place,
+            # instead of allocating a bool array, a uint8 view and a shifted copy per rule
+            bits = np.zeros(len(h), dtype=np.uint8)
+            mask = np.empty(len(h), dtype=bool)
+            rule_bits = [bit for bit, _ in OHLC_RULES] + [NEGATIVE_VOLUME]
+            for bit, (a, b) in zip(rule_bits, ((h, o), (h, c), (o, l), (c, l), (v, 0))):
+                np.less(a, b, out=mask)
+                np.bitwise_or(bits, bit, out=bits, where=mask)
+            # reduceat needs strictly increasing starts, so empty frames keep their zero flags
+            nonempty = lengths > 0
+            starts = np.concatenate([[0], np.cumsum(lengths)[:-1]])
+            per_symbol[nonempty] = np.bitwise_or.reduceat(bits, starts[nonempty])
+        return {symbol: int(flags) for symbol, flags in zip(symbols, per_symbol)}
+
     def generate_summary_stats(self, data_dict: Dict[str, pd.DataFrame]) -> pd.DataFrame:
-        """Generate summary statistics for all symbols"""
+        """Generate summary statistics for all symbols
+
+        The frames are concatenated once (symbol as the outer index level) so every aggregation
+        runs per group in pandas' Cython groupby kernels instead of a Python loop over symbols.
+        """
         print(f"\nGenerating summary statistics...")
 
-        summary_data = []
-        
-        for symbol, df in data_dict.items():
-            # Calculate returns
-            df_copy = df.copy()
-            df_copy['returns'] = df_copy['close'].pct_change()
-            
-            stats = {
-                'symbol': symbol,
-                'start_date': df.index[0],
-                'end_date': df.index[-1],
-                'observations': len(df),
-                'avg_price': df['close'].mean(),
-                'price_std': df['close'].std(),
-                'avg_volume': df['volume'].mean(),
-                'total_return': (df['close'].iloc[-1] / df['close'].iloc[0] - 1) * 100,
-                'volatility_annualized': df_copy['returns'].std() * np.sqrt(365 * 24) * 100,  # For hourly data
-                'max_drawdown': self._calculate_max_drawdown(df['close']),
-                'sharpe_ratio': self._calculate_sharpe_ratio(df_copy['returns']),
-                'null_values': df.isnull().sum().sum()
-            }
-            
-            summary_data.append(stats)
-        
-        summary_df = pd.DataFrame(summary_data)
+        if not data_dict:
+            return pd.DataFrame()
+
+        combined = pd.concat(list(data_dict.values()), keys=list(data_dict), names=['symbol', 'datetime'],
+                             copy=False, sort=False)
+        groups = combined.groupby(level='symbol', sort=False)
+        close = groups['close']
+
+        # Groups are contiguous blocks in data_dict order: first/last rows by position
+        observations = groups.size()
+        ends = observations.cumsum().to_numpy()
+        starts = ends - observations.to_numpy()
+        dates = combined.index.get_level_values('datetime')
+        closes = combined['close'].to_numpy()
+
+        returns = close.pct_change().groupby(level='symbol', sort=False)
+        returns_std = returns.std()
+        # Drawdown is path-dependent: fill a preallocated column straight from each symbol's
+        # close series rather than through groupby.apply's per-group Series and result boxing
+        max_drawdown = np.empty(len(data_dict), dtype=np.float64)
+        for i, df in enumerate(data_dict.values()):
+            max_drawdown[i] = self._calculate_max_drawdown(df['close'])
+
+        summary_df = pd.DataFrame({
+            'symbol': observations.index.to_numpy(),
+            'start_date': dates[starts],
+            'end_date': dates[ends - 1],
+            'observations': observations.to_numpy(),
+            'avg_price': close.mean().to_numpy(),
+            'price_std': close.std().to_numpy(),
+            'avg_volume': groups['volume'].mean().to_numpy(),
+            'total_return': (closes[ends - 1] / closes[starts] - 1) * 100,
+            'volatility_annualized': returns_std.to_numpy() * np.sqrt(365 * 24) * 100,  # For hourly data
+            'max_drawdown': max_drawdown,
+            'sharpe_ratio': self._calculate_sharpe_ratio(returns.mean(), returns_std).to_numpy(),
+            'null_values': combined.isnull().groupby(level='symbol', sort=False).sum().sum(axis=1).to_numpy()
+        })
         return summary_df
     
     def _calculate_max_drawdown(self, prices: pd.Series) -> float:
-        """Calculate maximum drawdown"""
-        cumulative = (1 + prices.pct_change()).cumprod()
-        running_max = cumulative.expanding().max()
+        """Calculate maximum drawdown
+
+        Plain NumPy passes over the close array (np.fmax.accumulate is the running max) instead of
+        pandas' expanding window. Gaps are forward-filled and the NaN returns they leave are skipped,
+        exactly as pct_change().cumprod() did.
+        """
+        p = (prices.ffill() if prices.hasnans else prices).to_numpy(dtype=np.float64)
+        if p.size < 2:
+            return np.nan
+        returns = p[1:] / p[:-1] - 1
+        cumulative = np.nancumprod(1 + returns)
+        if prices.hasnans:
+            cumulative[np.isnan(returns)] = np.nan
+        running_max = np.fmax.accumulate(cumulative)
         drawdown = (cumulative - running_max) / running_max
-        return drawdown.min() * 100
+        return np.nanmin(drawdown) * 100 if not np.isnan(drawdown).all() else np.nan
     
-    def _calculate_sharpe_ratio(self, returns: pd.Series, risk_free_rate: float = 0.02) -> float:
-        """Calculate annualized Sharpe ratio"""
-        if returns.std() == 0:
-            return 0
-        
-        excess_returns = returns - risk_free_rate / (365 * 24)  # Hourly risk-free rate
-        return (excess_returns.mean() / returns.std()) * np.sqrt(365 * 24)
+    def _calculate_sharpe_ratio(self, mean_return: pd.Series, std_return: pd.Series,
+                                risk_free_rate: float = 0.02) -> pd.Series:
+        """Calculate annualized Sharpe ratios from per-symbol mean/std of returns (0 where std is 0)"""
+        excess_mean = mean_return - risk_free_rate / (365 * 24)  # Hourly risk-free rate
+        sharpe = (excess_mean / std_return) * np.sqrt(365 * 24)
+        return sharpe.mask(std_return == 0, 0.0)
     
     def save_validation_results(self, validation_results: Dict, summary_stats: pd.DataFrame, timeframe: str):
         """Save validation results and summary statistics"""
@@ -289,96 +526,112 @@ class CryptoDataValidator:
 
         return validation_file, summary_file
 
-    def generate_symbol_manifests(self, manifest: Dict, timeframe: str):
+    def generate_symbol_manifests(self, manifest: Dict, timeframe: str,
+                                  data_dict: Optional[Dict[str, pd.DataFrame]] = None,
+                                  summary_stats: Optional[pd.DataFrame] = None):
         """Generate per-symbol YAML manifests with field descriptions and min/max stats
         Each symbol will get a file: data/crypto/USDT/<SYMBOL>/manifest_<timeframe>.yaml
+
+        Pass the data_dict from load_crypto_data (and its generate_summary_stats frame) to reuse the
+        loaded frames and already computed rows/dates/returns; symbols missing from them are re-read.
         """
-        field_descriptions = {
-            'open': 'Open price for the interval',
-            'high': 'Highest trade price during the interval',
-            'low': 'Lowest trade price during the interval',
-            'close': 'Close price for the interval',
-            'volume': 'Traded volume during the interval'
-        }
+        summary_rows = {}
+        if summary_stats is not None and not summary_stats.empty:
+            summary_rows = summary_stats.set_index('symbol').to_dict('index')
 
+        # Resolve files and reuse frames / summary rows here; the per-symbol work goes to workers
+        jobs, results = [], []
         for symbol, info in manifest['symbols'].items():
             filename = info['filename']
             # resolve file path (allow per-symbol subfolders)
-            filepath = self.data_dir / filename
-            if not filepath.exists():
-                matches = list(self.data_dir.rglob(filename))
-                if matches:
-                    filepath = matches[0]
-                else:
-                    print(f"Skipping manifest for {symbol}: file not found: {filename}")
-                    continue
-
-            df = pd.read_csv(filepath, index_col='datetime', parse_dates=True)
-
-            # Basic metadata
-            symbol_meta = {
-                'symbol': symbol,
-                'timeframe': timeframe,
-                'rows': int(len(df)),
-                'start_date': str(df.index[0]),
-                'end_date': str(df.index[-1]),
-                'total_return_pct': float((df['close'].iloc[-1] / df['close'].iloc[0] - 1) * 100)
-            }
-
-            # Field stats
-            fields = {}
-            for col in ['open', 'high', 'low', 'close', 'volume']:
-                if col not in df.columns:
-                    continue
-                col_series = df[col].dropna()
-                fields[col] = {
-                    'name': col,
-                    'description': field_descriptions.get(col, ''),
-                    'min': float(col_series.min()) if not col_series.empty else None,
-                    'max': float(col_series.max()) if not col_series.empty else None,
-                    'mean': float(col_series.mean()) if not col_series.empty else None,
-                    'median': float(col_series.median()) if not col_series.empty else None,
-                    'std': float(col_series.std()) if not col_series.empty else None,
-                    'nulls': int(df[col].isnull().sum())
+            filepath = self._resolve_data_file(filename, info.get('subfolder'))
+            if filepath is None:
+                results.append((symbol, filename, None))
+                continue
+            df = data_dict.get(symbol) if data_dict else None
+            if df is None:
+                df = self._cache.get(filepath)
+            row = summary_rows.get(symbol)
+            symbol_meta = None
+            if row is not None:
+                symbol_meta = {
+                    'rows': int(row['observations']),
+                    'start_date': str(row['start_date']),
+                    'end_date': str(row['end_date']),
+                    'total_return_pct': float(row['total_return'])
                 }
+            # Files that aren't loaded yet are read by the worker
+            jobs.append((symbol, timeframe, filepath if df is None else df, self.float_dtype, symbol_meta,
+                         filepath.parent / f"manifest_{timeframe}.yaml"))
+            results.append((symbol, filename, jobs[-1][-1]))
 
-            # Additional insights
-            insights = {
-                'price_range': {
-                    'min_close': fields.get('close', {}).get('min'),
-                    'max_close': fields.get('close', {}).get('max')
-                },
-                'avg_volume': fields.get('volume', {}).get('mean') if fields.get('volume') else None
-            }
+        # Each symbol's stats and YAML file are independent; a few ms each, so threads (no
+        # process start-up or pickling of frames) and the file writes overlap
+        with ThreadPoolExecutor(max_workers=max(1, min(32, len(jobs)))) as ex:
+            list(ex.map(_write_symbol_manifest, jobs))
+
+        for symbol, filename, manifest_path in results:
+            if manifest_path is None:
+                print(f"Skipping manifest for {symbol}: file not found: {filename}")
+            else:
+                print(f"Wrote manifest for {symbol}: {manifest_path}")
+
+
+def _write_symbol_manifest(job: Tuple) -> Path:
+    """Compute one symbol's field stats and write its manifest YAML (run on generate_symbol_manifests' thread pool).
+
+    `job` is (symbol, timeframe, frame or data file path, float dtype for that read,
+    symbol_meta or None, manifest_path); rows/dates/return are derived from the frame when no
+    summary row was available.
+    """
+    symbol, timeframe, source, float_dtype, symbol_meta, manifest_path = job
+    field_descriptions = {
+        'open': 'Open price for the interval',
+        'high': 'Highest trade price during the interval',
+        'low': 'Lowest trade price during the interval',
+        'close': 'Close price for the interval',
+        'volume': 'Traded volume during the interval'
+    }
+    df = source if isinstance(source, pd.DataFrame) else _read_ohlcv(source, dtype=float_dtype)
+
+    # Basic metadata
+    if symbol_meta is None:
+        symbol_meta = {
+            'rows': int(len(df)),
+            'start_date': str(df.index[0]),
+            'end_date': str(df.index[-1]),
+            'total_return_pct': float((df['close'].iloc[-1] / df['close'].iloc[0] - 1) * 100)
+        }
+
+    # Field stats: one vectorized agg over the OHLCV columns instead of a pass per stat
+    cols = [col for col in ['open', 'high', 'low', 'close', 'volume'] if col in df.columns]
+    agg = df[cols].agg(['min', 'max', 'mean', 'median', 'std', 'count']).to_dict()
+    nulls = df[cols].isnull().sum().to_dict()
+    fields = {}
+    for col in cols:
+        stats = agg[col]
+        has_values = stats['count'] > 0
+        fields[col] = {
+            'name': col,
+            'description': field_descriptions.get(col, ''),
+            **{k: float(stats[k]) if has_values else None for k in ('min', 'max', 'mean', 'median', 'std')},
+            'nulls': int(nulls[col])
+        }
+
+    # Additional insights
+    insights = {
+        'price_range': {
+            'min_close': fields.get('close', {}).get('min'),
+            'max_close': fields.get('close', {}).get('max')
+        },
+        'avg_volume': fields.get('volume', {}).get('mean') if fields.get('volume') else None
+    }
 
-            # Build YAML content manually
-            symbol_dir = filepath.parent
-            manifest_path = symbol_dir / f"manifest_{timeframe}.yaml"
-            with open(manifest_path, 'w', encoding='utf-8') as f:
-                f.write(f"symbol: {symbol}\n")
-                f.write(f"timeframe: {timeframe}\n")
-                f.write(f"rows: {symbol_meta['rows']}\n")
-                f.write(f"start_date: '{symbol_meta['start_date']}'\n")
-                f.write(f"end_date: '{symbol_meta['end_date']}'\n")
-                f.write(f"total_return_pct: {symbol_meta['total_return_pct']}\n")
-                f.write("fields:\n")
-                for col, meta in fields.items():
-                    f.write(f"  {col}:\n")
-                    f.write(f"    name: {meta['name']}\n")
-                    f.write(f"    description: '{meta['description']}'\n")
-                    f.write(f"    min: {meta['min']}\n")
-                    f.write(f"    max: {meta['max']}\n")
-                    f.write(f"    mean: {meta['mean']}\n")
-                    f.write(f"    median: {meta['median']}\n")
-                    f.write(f"    std: {meta['std']}\n")
-                    f.write(f"    nulls: {meta['nulls']}\n")
-                f.write("insights:\n")
-                f.write(f"  price_range:\n")
-                f.write(f"    min_close: {insights['price_range']['min_close']}\n")
-                f.write(f"    max_close: {insights['price_range']['max_close']}\n")
-                f.write(f"  avg_volume: {insights['avg_volume']}\n")
-
-            print(f"Wrote manifest for {symbol}: {manifest_path}")
+    doc = {'symbol': symbol, 'timeframe': timeframe, **symbol_meta, 'fields': fields, 'insights': insights}
+    # Serialize in memory, then write once
+    manifest_path.write_text(yaml.dump(doc, Dumper=_YamlDumper, sort_keys=False, default_flow_style=False),
+                             encoding='utf-8')
+    return manifest_path
 
 ##command
 
@@ -436,11 +689,11 @@ def main():
     
     print("\nData validation complete!")
     
-    # Generate per-symbol manifests (1h and 1d)
+    # Generate per-symbol manifests (1h and 1d), reusing the frames and stats loaded above
     if validator.hourly_manifest:
-        validator.generate_symbol_manifests(validator.hourly_manifest, '1h')
+        validator.generate_symbol_manifests(validator.hourly_manifest, '1h', hourly_data, hourly_summary)
     if validator.daily_manifest:
-        validator.generate_symbol_manifests(validator.daily_manifest, '1d')
+        validator.generate_symbol_manifests(validator.daily_manifest, '1d', daily_data, daily_summary)
 
     return hourly_data, daily_data, hourly_summary, daily_summary
 
@@ -0,0 +1,104 @@
+"""Unit tests for CryptoDataFetcher helpers in src/utils/crypto_data_fetcher.py (fake exchange, no network)."""
+from __future__ import annotations
+import sys
+import math
+import threading
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from src.utils.crypto_data_fetcher import CryptoDataFetcher
+
+HOUR_MS = 3_600_000
+
+
+class _FakeExchange:
+    """Hourly candles on every hour; `since` values listed in fail_at raise (fail_times each)"""
+
+    def __init__(self, fail_at=(), fail_times=1):
+        self.failures = {since: fail_times for since in fail_at}
+
+    def fetch_ohlcv(self, symbol, timeframe="1h", since=None, limit=1000):
+        if self.failures.get(since, 0) > 0:
+            self.failures[since] -= 1
+            raise TimeoutError("simulated timeout")
+        t = -(-since // HOUR_MS) * HOUR_MS
+        return [[t + i * HOUR_MS, 1.0, 2.0, 0.5, 1.5, 10.0] for i in range(limit)]
+
+
+def _fetcher(exchange) -> CryptoDataFetcher:
+    # bypass __init__: no exchange connection, markets or data directory needed
+    fetcher = object.__new__(CryptoDataFetcher)
+    fetcher.exchange = exchange
+    fetcher.rate_limit = 0
+    fetcher.max_workers = 4
+    fetcher.last_request_time = 0
+    fetcher._rate_lock = threading.Lock()
+    return fetcher
+
+
+def _timestamps(rows):
+    return [int(row[0]) for row in rows]
+
+
+def test_fetch_symbol_rows_retries_failed_page():
+    end = 3000 * HOUR_MS - 1
+    rows = _fetcher(_FakeExchange(fail_at=[1000 * HOUR_MS]))._fetch_symbol_rows("BTC/USDT", "1h", 0, end)
+    assert _timestamps(rows) == list(range(0, 3000 * HOUR_MS, HOUR_MS))
+
+
+def test_fetch_symbol_rows_never_leaves_interior_gap():
+    end = 3000 * HOUR_MS - 1
+    fetcher = _fetcher(_FakeExchange(fail_at=[1000 * HOUR_MS], fail_times=10))
+    rows = fetcher._fetch_symbol_rows("BTC/USDT", "1h", 0, end)
+    # a window that keeps failing truncates the history there instead of being skipped
+    assert _timestamps(rows) == list(range(0, 1000 * HOUR_MS, HOUR_MS))
+
+
+def _ohlcv(n: int, start: str = "2025-01-01", seed: int = 0) -> pd.DataFrame:
+    # prices around 60000 with tiny spread: where sum/sum-of-squares variance cancels badly
+    rng = np.random.default_rng(seed)
+    close = 60_000 + rng.uniform(-2, 2, n)
+    return pd.DataFrame(
+        {"open": close, "high": close + 1, "low": close - 1, "close": close, "volume": rng.uniform(0, 10, n)},
+        index=pd.date_range(start, periods=n, freq="min", name="datetime"),
+    )
+
+
+def _assert_fields_close(got: dict, want: dict):
+    assert got.keys() == want.keys()
+    for col in want:
+        for key in ("min", "max", "median", "nulls", "count"):
+            assert got[col][key] == want[col][key], (col, key)
+        for key in ("mean", "std", "m2"):
+            assert math.isclose(got[col][key], want[col][key], rel_tol=1e-12), (col, key)
+
+
+def test_field_stats_incremental_matches_full_recompute(tmp_path):
+    df = _ohlcv(200_000)
+    df.iloc[150_001:150_011, df.columns.get_loc("close")] = np.nan  # NaNs in the appended rows
+    fetcher = _fetcher(None)
+    prior = df.iloc[:150_000]
+    fetcher._write_manifest("BTC/USDT", tmp_path, "1m", prior)
+    # several appends, as repeated incremental updates would do
+    for stop in (170_000, 185_000, len(df)):
+        partial = df.iloc[:stop]
+        fetcher._write_manifest("BTC/USDT", tmp_path, "1m", partial, partial.iloc[len(prior):])
+        prior = partial
+    rows, manifest_fields = fetcher._read_manifest_fields(tmp_path, "1m")
+    assert rows == len(df) and "m2" in manifest_fields["close"]  # the next append can merge
+    incremental = fetcher._field_stats(df, tmp_path, "1m", df.iloc[:0])
+    _assert_fields_close(incremental, fetcher._field_stats(df, tmp_path, "1m"))
+    assert incremental["close"]["nulls"] == 10
+
+
+def test_field_stats_row_count_mismatch_recomputes(tmp_path):
+    df = _ohlcv(1_000)
+    fetcher = _fetcher(None)
+    fetcher._write_manifest("BTC/USDT", tmp_path, "1m", df.iloc[:500])
+    # 500 (manifest) + 100 new != 1000 rows: the manifest can't be trusted, so stats are recomputed
+    got = fetcher._field_stats(df, tmp_path, "1m", df.iloc[-100:])
+    assert got == fetcher._field_stats(df, tmp_path, "1m")
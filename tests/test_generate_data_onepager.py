@@ -0,0 +1,67 @@
+"""Unit tests for the lightweight CSV readers in scripts/generate_data_onepager.py (no network)."""
+from __future__ import annotations
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "scripts"))
+
+import generate_data_onepager as onepager
+
+
+def _write_csv(symbol_dir: Path, rows: list[str]) -> Path:
+    symbol_dir.mkdir(parents=True, exist_ok=True)
+    path = symbol_dir / "crypto_BTC_USDT_1h.csv"
+    path.write_text("\n".join(["datetime,open,high,low,close,volume", *rows]) + "\n", encoding="utf8")
+    return path
+
+
+def test_tail_line_widens_window_for_long_lines(tmp_path):
+    path = tmp_path / "f.csv"
+    path.write_text("a,b\n" + "x" * 50 + ",1\n\n", encoding="utf8")
+    assert onepager._tail_line(path, n=8) == "x" * 50 + ",1"
+
+
+def test_read_csv_bounds_matches_full_stats(tmp_path):
+    symbol_dir = tmp_path / "BTC"
+    _write_csv(symbol_dir, [
+        "2025-11-03 03:00:00,1,2,0.5,1.5,10",
+        "2025-11-03 04:00:00,1.5,3,1,2.5,20",
+    ])
+    bounds = onepager.read_csv_bounds(symbol_dir, "BTC", "1h")
+    stats = onepager.read_csv_stats(symbol_dir, "BTC", "1h")
+    assert bounds == {"start": "2025-11-03 03:00:00", "end": "2025-11-03 04:00:00", "last_close": 2.5}
+    assert {k: stats[k] for k in bounds} == bounds
+    assert stats["rows"] == 2 and stats["min_price"] == 0.5 and stats["max_price"] == 3
+
+
+def test_read_csv_bounds_header_only(tmp_path):
+    symbol_dir = tmp_path / "BTC"
+    _write_csv(symbol_dir, [])
+    assert onepager.read_csv_bounds(symbol_dir, "BTC", "1h") is None
+
+
+def test_parquet_readers_match_csv(tmp_path):
+    import pandas as pd
+
+    csv_dir, pq_dir = tmp_path / "csv" / "BTC", tmp_path / "pq" / "BTC"
+    csv_path = _write_csv(csv_dir, [
+        "2025-11-03 03:00:00,1,2,0.5,1.5,10",
+        "2025-11-03 04:00:00,1.5,3,1,2.5,20",
+    ])
+    pq_dir.mkdir(parents=True)
+    # same layout the fetcher writes: datetime index, float64 OHLCV
+    df = pd.read_csv(csv_path, index_col="datetime", parse_dates=True).astype("float64")
+    df.to_parquet(pq_dir / "crypto_BTC_USDT_1h.parquet")
+    for reader in (onepager.read_csv_stats, onepager.read_csv_bounds):
+        assert reader(pq_dir, "BTC", "1h") == reader(csv_dir, "BTC", "1h")
+
+
+def test_fingerprint_tracks_symbol_dirs_and_parquet(tmp_path):
+    btc, eth = tmp_path / "BTC", tmp_path / "ETH"
+    _write_csv(btc, ["2025-11-03 03:00:00,1,2,0.5,1.5,10"])
+    before = onepager._fingerprint([btc])
+    eth.mkdir()
+    with_dir = onepager._fingerprint([btc, eth])
+    (eth / "crypto_ETH_USDT_1h.parquet").write_bytes(b"placeholder")
+    with_parquet = onepager._fingerprint([btc, eth])
+    assert len({before, with_dir, with_parquet}) == 3
@@ -1,15 +1,23 @@
-"""Pytest for verifying requirements imports (fast smoke test).
+"""Pytest for verifying requirements are installed, i.e. resolvable by the import system (smoke test).
+
+Modules are located with importlib.util.find_spec but not executed, so a package that is
+installed but fails at import time still passes.
 
 This replaces the previous script-style smoke test and is suitable for CI.
 """
 from __future__ import annotations
 import importlib
+import importlib.util
 from pathlib import Path
 import re
+import sys
+
+import pytest
 
 
 REQ_FILE = Path(__file__).resolve().parents[1] / "requirements.txt"
 
+
 # map packages to module names when they differ
 SIMPLE_MAP = {
     "scikit-learn": "sklearn",
@@ -17,49 +25,49 @@ SIMPLE_MAP = {
     "PyYAML": "yaml",
     "pillow": "PIL",
 }
+# package names are case-insensitive (PyYAML == pyyaml); fold the keys once
+_SIMPLE_MAP_CI = {k.lower(): v for k, v in SIMPLE_MAP.items()}
+
+# the package name is the leading run of name characters on a line, so comment lines,
+# blank lines, inline comments and version/extras specifiers all fall out of the match
+_PKG_LINE_RE = re.compile(r"(?m)^[ \t]*([A-Za-z0-9_.\-]+)")
 
 
 def read_pkg_names(path: Path) -> list[str]:
     if not path.exists():
         return []
-    out = []
-    with path.open("r", encoding="utf-8") as f:
-        for line in f:
-            line = line.strip()
-            if not line or line.startswith("#"):
-                continue
-            line = re.split(r"\s+#", line)[0].strip()
-            name = re.split(r"[<=>!~\[]", line)[0].strip()
-            if name:
-                out.append(name)
-    return out
-
-
-def try_simple_import(pkg_name: str) -> bool:
-    mapped = SIMPLE_MAP.get(pkg_name)
-    tries = []
-    if mapped:
-        tries.append(mapped)
-    tries.append(pkg_name)
-    tries.append(pkg_name.replace('-', '_'))
+    # one regex pass over the whole file instead of a Python loop over its lines
+    return _PKG_LINE_RE.findall(path.read_text(encoding="utf-8"))
+
+
+def is_installed(pkg_name: str) -> bool:
+    mapped = _SIMPLE_MAP_CI.get(pkg_name.lower())
+    # ordered and de-duplicated: "numpy" is tried once, not twice
+    tries = list(dict.fromkeys(m for m in (mapped, pkg_name, pkg_name.replace('-', '_')) if m))
 
     for mod in tries:
-        try:
-            importlib.import_module(mod)
+        # already imported (by pytest, conftest or an earlier package): nothing to do
+        if mod in sys.modules:
             return True
-        except Exception:
+        try:
+            # resolving the finder/loader is enough to know it's installed; executing the
+            # module body (and everything it imports) is what made this test slow
+            if importlib.util.find_spec(mod) is not None:
+                return True
+        except (ModuleNotFoundError, ValueError):
+            # malformed name, or a dotted name whose parent package is missing
             continue
     return False
 
 
-def test_requirements_imports():
-    names = read_pkg_names(REQ_FILE)
-    assert names, f"No packages found in {REQ_FILE}"
+_PKGS = read_pkg_names(REQ_FILE)
+
+
+def test_requirements_listed():
+    assert _PKGS, f"No packages found in {REQ_FILE}"
 
-    failed = []
-    for name in names:
-        ok = try_simple_import(name)
-        if not ok:
-            failed.append(name)
 
-    assert not failed, f"Failed to import: {failed}"
+# one test per package: failures are pinpointed and `pytest -n auto` can spread the lookups
+@pytest.mark.parametrize("pkg", _PKGS)
+def test_requirement_installed(pkg):
+    assert is_installed(pkg), f"Not installed (no module found for it): {pkg}"